@@ -0,0 +1,326 @@
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+
+import settings
+from data_ingest import load_snapshot, load_store, load_store_streaming
+from intent_router import KEYWORD_TIER, route_intent
+from sprint_analytics import FleetAnalytics
+from sprint_data import calculate_risk, get_latest_sprint
+from sprint_forecast import SprintForecaster
+from synthetic_data import generate_data, write_data
+
+# Latency / throughput benchmark for the chatbot's question path.
+#
+#   python benchmark.py --out bench.json                  # default scales
+#   python benchmark.py --stories 0 100000 --model --out bench.json
+#
+# Each scale runs in a fresh process: synthetic data with that many user
+# stories (0 = the shipped Data.json) is written to a temp file, loaded, and a
+# labelled query corpus is replayed through the same stages the app runs for a
+# question (intent routing, entity extraction, data lookups). The app script
+# itself cannot be imported outside Streamlit, so the harness calls the
+# modules it uses. Without --model the zero-shot tier is not loaded and
+# queries the keyword tier cannot answer count as unanswered.
+#
+# Reports p50/p95/p99 latency per stage, queries per second, peak RSS and
+# intent / entity accuracy, as JSON for comparing runs across versions.
+
+CONFIDENCE_THRESHOLD = 0.7
+DEFAULT_STORIES = [0, 1000, 10000, 100000]
+PERCENTILES = (50, 95, 99)
+
+# (template, expected intent); None marks questions the bot should not answer.
+# {team}, {story} and {bug} are filled from the data. The first four are the
+# examples shown in the UI.
+QUERY_TEMPLATES = [
+    ("What is the sprint status of {team}", "sprint status"),
+    ("How should {team}'s next sprint look like?", "sprint prediction"),
+    ("How long has {story} been open?", "user story duration"),
+    ("What is the bug progress for {team}?", "bug tracking"),
+    ("Who is working on {story}?", "user story assignment"),
+    ("Who is {story} assigned to?", "user story assignment"),
+    ("Which teams do we have?", "list teams"),
+    ("Show me the high-risk teams", "list teams"),
+    ("Which teams ended a sprint this week?", "list teams"),
+    ("Who is in {team}?", "team members"),
+    ("List the members of {team}", "team members"),
+    ("Forecast the next sprint for {team}", "sprint prediction"),
+    ("Give me the latest sprint summary for {team}", "sprint status"),
+    ("How many bugs does {team} have open?", "bug tracking"),
+    ("Export a PDF report for {team}", "export report"),
+    # Phrasings the keyword tier leaves to the model
+    ("How is {team} doing?", "sprint status"),
+    ("Who belongs to {team}?", "team members"),
+    ("What will {team} deliver after this iteration?", "sprint prediction"),
+    ("Is {bug} fixed?", "bug tracking"),
+    ("Send me a document summarising {team}", "export report"),
+    ("Tell me a joke", None),
+]
+
+
+# Labelled queries: (text, expected intent, expected team, story and bug IDs)
+def build_corpus(store, size, seed=0):
+    rng = random.Random(seed)
+    stories = [(s.id, t.team_name) for t in store.teams for s in t.user_stories]
+    bugs = [(b.id, t.team_name) for t in store.teams for b in t.bugs]
+    corpus = []
+    for i in range(size):
+        template, intent = QUERY_TEMPLATES[i % len(QUERY_TEMPLATES)]
+        team = rng.choice(store.teams).team_name
+        story = rng.choice(stories)[0] if stories and "{story}" in template else None
+        bug = rng.choice(bugs)[0] if bugs and "{bug}" in template else None
+        if ("{story}" in template and story is None) or ("{bug}" in template and bug is None):
+            continue
+        text = template.format(team=team, story=story, bug=bug)
+        corpus.append({
+            "text": text,
+            "intent": intent,
+            "team": team if "{team}" in template else None,
+            "story": story,
+            "bug": bug,
+        })
+    return corpus
+
+
+def load_model():
+    from intent_models import load_intent_classifier
+
+    return load_intent_classifier(
+        settings.INTENT_MODEL_MODE,
+        backend=settings.INTENT_BACKEND,
+        nli_model=settings.NLI_MODEL,
+        embedding_model=settings.EMBEDDING_MODEL,
+        local_files_only=settings.MODEL_LOCAL_FILES_ONLY,
+    )
+
+
+# The data generate_response_with_nlp reads for each intent, without the text
+def answer_lookup(store, intent, entities, text, analytics, forecaster):
+    if intent == "list teams":
+        text = text.lower()
+        if "high risk" in text or "high-risk" in text or "at risk" in text:
+            return analytics.teams_with_risk()
+        if "this week" in text or "ended" in text or "recent" in text:
+            return analytics.teams_with_recent_sprint(days=7)
+        return [t.team_name for t in store.teams]
+    if intent in ("user story assignment", "user story duration"):
+        return entities.story.record if entities.story else None
+    if entities.team is None:
+        return None
+    team = entities.team.record
+    if intent == "bug tracking":
+        return store.get_bug_counts(team)
+    if intent == "sprint status":
+        return get_latest_sprint(team), calculate_risk(team)
+    if intent == "sprint prediction":
+        return forecaster.forecast(team)
+    if intent == "team members":
+        return [(m.name, m.role) for m in team.members]
+    return None
+
+
+def entities_match(query, entities):
+    found = {
+        "team": entities.team.record.team_name if entities.team else None,
+        "story": entities.story.record.id if entities.story else None,
+        "bug": entities.bug.record.id if entities.bug else None,
+    }
+    return all(query[kind] is None or query[kind] == found[kind] for kind in found)
+
+
+def latency_summary(samples):
+    if not samples:
+        return {"count": 0}
+    values = np.asarray(samples) * 1000
+    summary = {"count": len(values), "mean_ms": round(float(values.mean()), 4)}
+    for p, value in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+        summary[f"p{p}_ms"] = round(float(value), 4)
+    summary["max_ms"] = round(float(values.max()), 4)
+    return summary
+
+
+def ratio(numerator, denominator):
+    return round(numerator / denominator, 4) if denominator else None
+
+
+def peak_rss_mb():
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+def write_scale_data(path, stories, stories_per_team=200, seed=0):
+    teams = max(1, stories // stories_per_team)
+    data = generate_data(teams=teams, stories_per_team=stories_per_team, bugs_per_team=stories_per_team // 4,
+                         sprints_per_team=26, members_per_team=8, seed=seed)
+    write_data(data, path)
+
+
+# One scale, in its own process so peak RSS covers only loading and the replay
+def run_scale(data_path, queries=1000, repeat=3, use_model=False, seed=0):
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot_path = os.path.join(tmp, "data.snapshot")
+
+        load = {}
+        _, load["streaming_s"] = timed(load_store_streaming, data_path)
+        load_store(data_path, snapshot_path)
+        store, load["snapshot_s"] = timed(load_snapshot, snapshot_path)
+        analytics, load["analytics_s"] = timed(FleetAnalytics, store)
+        load = {k: round(v, 4) for k, v in load.items()}
+
+        classifier = None
+        if use_model:
+            classifier, load["model_s"] = timed(load_model)
+            load["model_s"] = round(load["model_s"], 4)
+
+        def fallback(text, labels):
+            if classifier is None:
+                return None, 0.0
+            result = classifier(text, labels)
+            return result["labels"][0], result["scores"][0]
+
+        corpus = build_corpus(store, queries, seed)
+        forecaster = SprintForecaster()
+        stages = {"intent": [], "keyword": [], "zero_shot": [], "entities": [], "lookup": [], "total": []}
+        counts = dict.fromkeys(
+            ("keyword", "keyword_correct", "zero_shot", "zero_shot_correct", "routed_correct",
+             "entity_queries", "entity_correct"), 0)
+
+        started = time.perf_counter()
+        for run in range(repeat):
+            for query in corpus:
+                text = query["text"]
+                t0 = time.perf_counter()
+                intent, score, tier = route_intent(text, fallback)
+                t1 = time.perf_counter()
+                entities = None
+                if score >= CONFIDENCE_THRESHOLD:
+                    entities = store.extract_entities(text)
+                    t2 = time.perf_counter()
+                    answer_lookup(store, intent, entities, text, analytics, forecaster)
+                    t3 = time.perf_counter()
+                    stages["entities"].append(t2 - t1)
+                    stages["lookup"].append(t3 - t2)
+                else:
+                    t3 = t1
+                stages["intent"].append(t1 - t0)
+                stages["keyword" if tier == KEYWORD_TIER else "zero_shot"].append(t1 - t0)
+                stages["total"].append(t3 - t0)
+                if run:
+                    continue
+                # Accuracy is counted on the first pass only
+                answered = score >= CONFIDENCE_THRESHOLD
+                correct = intent == query["intent"]
+                if tier == KEYWORD_TIER:
+                    counts["keyword"] += 1
+                    counts["keyword_correct"] += correct
+                elif classifier is not None:
+                    counts["zero_shot"] += 1
+                    counts["zero_shot_correct"] += answered and correct
+                counts["routed_correct"] += (answered and correct) or (not answered and query["intent"] is None)
+                if answered and any(query[kind] for kind in ("team", "story", "bug")):
+                    counts["entity_queries"] += 1
+                    counts["entity_correct"] += entities_match(query, entities)
+        elapsed = time.perf_counter() - started
+
+    return {
+        "data": {
+            "teams": len(store.teams),
+            "user_stories": len(store.stories_by_id),
+            "bugs": len(store.bugs_by_id),
+            "sprints": sum(len(t.sprints) for t in store.teams),
+        },
+        "load": load,
+        "queries": len(corpus) * repeat,
+        "qps": round(len(corpus) * repeat / elapsed, 1) if elapsed else None,
+        "latency": {stage: latency_summary(samples) for stage, samples in stages.items()},
+        "accuracy": {
+            "keyword_coverage": ratio(counts["keyword"], len(corpus)),
+            "keyword": ratio(counts["keyword_correct"], counts["keyword"]),
+            "zero_shot": ratio(counts["zero_shot_correct"], counts["zero_shot"]) if classifier else None,
+            "routed": ratio(counts["routed_correct"], len(corpus)),
+            "entities": ratio(counts["entity_correct"], counts["entity_queries"]),
+        },
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark intent routing, entity lookup and answers")
+    parser.add_argument("--stories", type=int, nargs="+", default=DEFAULT_STORIES,
+                        help="user stories per scale (0 = the --data file)")
+    parser.add_argument("--data", default=settings.DATA_PATH, help="data file for scale 0 (default: settings.py)")
+    parser.add_argument("--stories-per-team", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=1000, help="corpus size per scale")
+    parser.add_argument("--repeat", type=int, default=3, help="passes over the corpus")
+    parser.add_argument("--model", action="store_true", help="load the zero-shot model (settings.py)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="write the JSON results to this file")
+    args = parser.parse_args(argv)
+
+    runs = []
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        for stories in args.stories:
+            data_path = args.data
+            if stories:
+                data_path = os.path.join(tmp, f"data-{stories}.json")
+                with ProcessPoolExecutor(1, mp_context=context) as pool:
+                    pool.submit(write_scale_data, data_path, stories, args.stories_per_team, args.seed).result()
+            with ProcessPoolExecutor(1, mp_context=context) as pool:
+                run = pool.submit(run_scale, data_path, args.queries, args.repeat, args.model, args.seed).result()
+            run = {"stories": stories, "data_file": None if stories else data_path, **run}
+            runs.append(run)
+            total = run["latency"]["total"]
+            print(f"{stories or os.path.basename(data_path)}: {run['qps']} qps, total p95 {total.get('p95_ms')} ms, "
+                  f"peak RSS {run['peak_rss_mb']} MB", file=sys.stderr)
+
+    results = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "settings": {"intent_model_mode": settings.INTENT_MODEL_MODE, "intent_backend": settings.INTENT_BACKEND},
+        "args": vars(args),
+        "runs": runs,
+    }
+    text = json.dumps(results, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+import threading
+from io import BytesIO
+
+from response_cache import MISSING, LRUCache
+
+# Sprint charts, rendered either to image bytes with matplotlib or as
+# Vega-Lite specs that the browser draws.
+#
+# Matplotlib figures are built with matplotlib.figure.Figure rather than
+# pyplot, so nothing is registered globally and nothing leaks between reruns.
+# One figure per chart type is reused (cleared before each render, under a
+# lock since sessions share it), and rendered bytes are cached per team and
+# data version. matplotlib itself is imported on the first render, so the
+# Vega-Lite backend never loads it.
+
+VELOCITY = "velocity"
+BLOCKERS_BUGS = "blockers_bugs"
+COMPLETION_RATIO = "completion_ratio"
+
+
+def sprint_labels(team):
+    return [f"Sprint {s.sprint_id}" for s in team.sprints]
+
+
+def draw_velocity(ax, team):
+    ax.plot(sprint_labels(team), [s.velocity for s in team.sprints], marker='o', linewidth=2)
+    ax.set_title(f"Velocity Over Time – {team.team_name}")
+    ax.set_ylabel("Story Points")
+    ax.set_xlabel("Sprint")
+    ax.grid(True)
+
+
+def draw_blockers_bugs(ax, team):
+    x = sprint_labels(team)
+    blockers = [s.blockers for s in team.sprints]
+    bugs = [s.bugs_reported for s in team.sprints]
+    ax.bar(x, blockers, label="Blockers", alpha=0.7)
+    ax.bar(x, bugs, bottom=blockers, label="Bugs", alpha=0.7)
+    ax.set_title(f"Blockers & Bugs – {team.team_name}")
+    ax.set_ylabel("Count")
+    ax.set_xlabel("Sprint")
+    ax.legend()
+
+
+def draw_completion_ratio(ax, team):
+    x = sprint_labels(team)
+    ax.plot(x, [s.story_points_completed for s in team.sprints], label="Completed", marker='o')
+    ax.plot(x, [s.story_points_planned for s in team.sprints], label="Planned", linestyle='--', marker='x')
+    ax.set_title(f"Planned vs Completed – {team.team_name}")
+    ax.set_ylabel("Story Points")
+    ax.set_xlabel("Sprint")
+    ax.legend()
+    ax.grid(True)
+
+
+DRAW_FUNCTIONS = {
+    VELOCITY: draw_velocity,
+    BLOCKERS_BUGS: draw_blockers_bugs,
+    COMPLETION_RATIO: draw_completion_ratio,
+}
+
+
+# Vega-Lite specs with the data inlined
+def velocity_spec(team):
+    return {
+        "title": f"Velocity Over Time – {team.team_name}",
+        "data": {"values": [{"sprint": f"Sprint {s.sprint_id}", "velocity": s.velocity} for s in team.sprints]},
+        "mark": {"type": "line", "point": True, "strokeWidth": 2},
+        "encoding": {
+            "x": {"field": "sprint", "type": "ordinal", "title": "Sprint", "sort": None},
+            "y": {"field": "velocity", "type": "quantitative", "title": "Story Points"},
+        },
+    }
+
+
+def blockers_bugs_spec(team):
+    values = []
+    for s in team.sprints:
+        values.append({"sprint": f"Sprint {s.sprint_id}", "kind": "Blockers", "count": s.blockers})
+        values.append({"sprint": f"Sprint {s.sprint_id}", "kind": "Bugs", "count": s.bugs_reported})
+    return {
+        "title": f"Blockers & Bugs – {team.team_name}",
+        "data": {"values": values},
+        "mark": {"type": "bar", "opacity": 0.7},
+        "encoding": {
+            "x": {"field": "sprint", "type": "ordinal", "title": "Sprint", "sort": None},
+            "y": {"field": "count", "type": "quantitative", "title": "Count", "stack": "zero"},
+            "color": {"field": "kind", "type": "nominal", "title": None},
+        },
+    }
+
+
+def completion_ratio_spec(team):
+    values = []
+    for s in team.sprints:
+        values.append({"sprint": f"Sprint {s.sprint_id}", "series": "Completed", "points": s.story_points_completed})
+        values.append({"sprint": f"Sprint {s.sprint_id}", "series": "Planned", "points": s.story_points_planned})
+    return {
+        "title": f"Planned vs Completed – {team.team_name}",
+        "data": {"values": values},
+        "mark": {"type": "line", "point": True},
+        "encoding": {
+            "x": {"field": "sprint", "type": "ordinal", "title": "Sprint", "sort": None},
+            "y": {"field": "points", "type": "quantitative", "title": "Story Points"},
+            "color": {"field": "series", "type": "nominal", "title": None},
+            "strokeDash": {"field": "series", "type": "nominal", "title": None},
+        },
+    }
+
+
+SPEC_FUNCTIONS = {
+    VELOCITY: velocity_spec,
+    BLOCKERS_BUGS: blockers_bugs_spec,
+    COMPLETION_RATIO: completion_ratio_spec,
+}
+
+
+class ChartRenderer:
+    def __init__(self, cache_size=256, dpi=100):
+        self.dpi = dpi
+        self.cache = LRUCache(cache_size)
+        self.figures = {}
+        self.lock = threading.Lock()
+
+    def figure(self, kind):
+        fig = self.figures.get(kind)
+        if fig is None:
+            from matplotlib.figure import Figure
+
+            fig = self.figures[kind] = Figure(figsize=(6.4, 4.8), dpi=self.dpi)
+        return fig
+
+    # PNG or SVG bytes of chart `kind`; `data_version` identifies the team's data
+    def render(self, kind, team, data_version=None, fmt="png"):
+        key = (kind, team.team_name, data_version, fmt)
+        image = self.cache.get(key)
+        if image is not MISSING:
+            return image
+        with self.lock:
+            fig = self.figure(kind)
+            fig.clear()
+            DRAW_FUNCTIONS[kind](fig.add_subplot(), team)
+            buffer = BytesIO()
+            fig.savefig(buffer, format=fmt)
+            fig.clear()
+        image = buffer.getvalue()
+        self.cache.put(key, image, tags=[team.team_name])
+        return image
+
+    def spec(self, kind, team):
+        return SPEC_FUNCTIONS[kind](team)
+
+    # Refresher callback
+    def invalidate_teams(self, team_names, store=None):
+        self.cache.invalidate_tags(team_names)
@@ -0,0 +1,140 @@
+import threading
+import time
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+
+# Background execution of chat questions.
+#
+# The app submits each question as a job and renders whatever the job has
+# reached so far (its latest status, then the answer), so a rerun never blocks
+# on model inference. Jobs run on a thread pool shared by all sessions.
+#
+# A new question from a session supersedes that session's older ones: queued
+# jobs are cancelled outright, running ones are flagged and stop at their next
+# report() checkpoint, and their results are never shown. A session may have at
+# most `max_pending` unfinished jobs (superseded ones still running included),
+# so retyping quickly cannot pile up work behind a slow model call.
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+TIMED_OUT = "timed out"
+
+
+class QueueFull(RuntimeError):
+    pass
+
+
+class ChatJob:
+    def __init__(self, session_id, query, timeout_seconds=None):
+        self.session_id = session_id
+        self.query = query
+        self.status = "Queued..."
+        self.submitted = time.monotonic()
+        self.finished = None
+        self.deadline = self.submitted + timeout_seconds if timeout_seconds else None
+        self.superseded = threading.Event()
+        self.timed_out = False
+        self.future = None
+
+    # Progress callback for the job function; raises CancelledError once the
+    # job is superseded or timed out so the worker stops early
+    def report(self, status):
+        if self.superseded.is_set():
+            raise CancelledError()
+        self.status = status
+
+    def cancel(self):
+        self.superseded.set()
+        self.future.cancel()
+
+    # Cancels the job once its deadline has passed; True if it timed out
+    def check_timeout(self):
+        if self.deadline is not None and not self.future.done() and time.monotonic() > self.deadline:
+            self.timed_out = True
+            self.cancel()
+        return self.timed_out
+
+    def done(self):
+        return self.timed_out or self.superseded.is_set() or self.future.done()
+
+    def state(self):
+        if self.timed_out:
+            return TIMED_OUT
+        if self.superseded.is_set() or self.future.cancelled():
+            return CANCELLED
+        if not self.future.done():
+            return RUNNING if self.future.running() else QUEUED
+        return FAILED if self.future.exception() is not None else DONE
+
+    def elapsed(self):
+        return (self.finished or time.monotonic()) - self.submitted
+
+    def result(self):
+        return self.future.result(0)
+
+
+class ChatPipeline:
+    def __init__(self, max_workers=4, max_pending=2, timeout_seconds=30):
+        self.executor = ThreadPoolExecutor(max_workers, thread_name_prefix="chat")
+        self.max_pending = max(1, max_pending)
+        self.timeout_seconds = timeout_seconds
+        self.sessions = {}
+        # Re-entrant: cancelling a queued job runs its _finish callback right away
+        self.lock = threading.RLock()
+
+    # Runs fn(query, report) in the background, where report(status) updates
+    # the job's status; raises QueueFull when the session has too many
+    # unfinished jobs, in which case the earlier jobs are left untouched
+    def submit(self, session_id, query, fn):
+        with self.lock:
+            jobs = self.sessions.get(session_id, [])
+            # Queued jobs will be cancelled outright; only running ones stay unfinished
+            running = [job for job in jobs if job.future.running()]
+            if len(running) >= self.max_pending:
+                raise QueueFull(f"{len(running)} earlier questions are still being processed")
+            for job in jobs:
+                job.cancel()
+            jobs = [job for job in jobs if not job.future.done()]
+            job = ChatJob(session_id, query, self.timeout_seconds)
+            job.future = self.executor.submit(self._run, job, fn)
+            self.sessions[session_id] = jobs + [job]
+        job.future.add_done_callback(lambda _: self._finish(job))
+        return job
+
+    def cancel_session(self, session_id):
+        with self.lock:
+            for job in self.sessions.get(session_id, []):
+                job.cancel()
+
+    def pending(self, session_id=None):
+        with self.lock:
+            if session_id is not None:
+                return len(self.sessions.get(session_id, []))
+            return sum(len(jobs) for jobs in self.sessions.values())
+
+    def stats(self):
+        with self.lock:
+            return {
+                "sessions": len(self.sessions),
+                "pending_jobs": sum(len(jobs) for jobs in self.sessions.values()),
+                "max_pending_per_session": self.max_pending,
+                "timeout_seconds": self.timeout_seconds,
+            }
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job, fn):
+        job.report("Thinking...")
+        return fn(job.query, job.report)
+
+    def _finish(self, job):
+        job.finished = time.monotonic()
+        with self.lock:
+            jobs = [j for j in self.sessions.get(job.session_id, []) if j is not job]
+            if jobs:
+                self.sessions[job.session_id] = jobs
+            else:
+                self.sessions.pop(job.session_id, None)
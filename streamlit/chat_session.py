@@ -0,0 +1,176 @@
+import re
+import sys
+import threading
+import weakref
+from collections import deque
+from dataclasses import dataclass
+
+from entity_extractor import STORY, TEAM, WORK_ITEM_ID_PATTERN, Entities, Entity
+from intent_router import INTENT_LABELS
+
+# Multi-turn chat state, one ChatSession per Streamlit session.
+#
+# A session remembers the last team and user story it resolved, so follow-ups
+# ("and what about its bugs?") answer about them without running entity
+# extraction again. Context holds names and IDs rather than records, so it
+# stays valid across data refreshes.
+#
+# History is capped per session by turns and approximate bytes. Every session
+# also registers with one shared HistoryBudget, which trims the oldest turns
+# of the largest history once all sessions together go over the server-wide
+# budget. Sessions that end are dropped from the budget automatically.
+
+# Words that refer back to the previous team or story
+FOLLOW_UP_PATTERN = re.compile(
+    r"\b(?:it|its|they|them|their|that team|this team|that story|this story)\b"
+)
+
+# Questions that name a team or work item themselves never use the context,
+# even when the name is unknown. "team <word>" only counts as a name when the
+# word is not part of the question itself ("its team members").
+TEAM_NAME_PATTERN = re.compile(r"\bteam\s+([a-z0-9]+)")
+WORK_ITEM_ID = re.compile(WORK_ITEM_ID_PATTERN)
+NOT_TEAM_NAME_WORDS = frozenset(word for label in INTENT_LABELS for word in label.split()) | {
+    "bugs", "defects", "lineup", "line", "roster", "velocity", "risk", "forecast", "progress",
+    "overview", "summary", "performance", "health", "size", "lead", "leader", "name", "names",
+    "sprints", "stories", "is", "are", "was", "has", "have", "had", "does", "did", "doing", "will",
+    "and", "or", "of", "in", "on", "for", "to", "with", "this", "that", "the", "now", "today",
+}
+
+
+def is_follow_up(text):
+    return FOLLOW_UP_PATTERN.search(text.lower()) is not None
+
+
+def names_entity(text):
+    text = text.lower()
+    if WORK_ITEM_ID.search(text):
+        return True
+    return any(word not in NOT_TEAM_NAME_WORDS for word in TEAM_NAME_PATTERN.findall(text))
+
+
+@dataclass(slots=True, frozen=True)
+class ChatTurn:
+    question: str
+    reply: str
+    intent: str = None  # None when no answer was produced (timeout, failure)
+    score: float = 0.0
+    tier: str = None
+    chart_team: str = None  # team name; the record is looked up again when drawn
+
+
+def turn_size(turn):
+    return sys.getsizeof(turn) + sum(
+        sys.getsizeof(getattr(turn, name)) for name in ChatTurn.__slots__)
+
+
+# Replaced rather than mutated, so a running job keeps the context it started with
+@dataclass(slots=True, frozen=True)
+class ChatContext:
+    team: str = None
+    story: str = None
+
+    def empty(self):
+        return self.team is None and self.story is None
+
+    # Entities for a follow-up question, resolved against the current data
+    def entities(self, store):
+        entities = Entities()
+        team = store.get_team(self.team) if self.team else None
+        if team is not None:
+            entities.teams.append(Entity(TEAM, team.team_name, 0, 0, team, team))
+        match = store.find_story(self.story) if self.story else None
+        if match is not None:
+            story, story_team = match
+            entities.stories.append(Entity(STORY, story.id, 0, 0, story, story_team))
+        return entities
+
+    # Key part for answers that were built from this context
+    def key(self):
+        return self.team, self.story
+
+
+class ChatSession:
+    def __init__(self, max_turns=50, max_bytes=256 * 1024):
+        self.max_turns = max(1, max_turns)
+        self.max_bytes = max_bytes
+        self.turns = deque()
+        self.bytes = 0
+        self.context = ChatContext()
+        self.lock = threading.Lock()
+
+    # Records a finished turn and remembers the team / story it was about
+    def add_turn(self, turn, entities=None):
+        with self.lock:
+            self.turns.append((turn, turn_size(turn)))
+            self.bytes += self.turns[-1][1]
+            while len(self.turns) > 1 and (
+                len(self.turns) > self.max_turns
+                or (self.max_bytes is not None and self.bytes > self.max_bytes)
+            ):
+                self._drop_oldest()
+            if entities is not None:
+                if entities.story:
+                    self.context = ChatContext(entities.story.team.team_name, entities.story.record.id)
+                elif entities.team:
+                    self.context = ChatContext(entities.team.record.team_name)
+
+    def history(self):
+        with self.lock:
+            return [turn for turn, _ in self.turns]
+
+    def clear(self):
+        with self.lock:
+            self.turns.clear()
+            self.bytes = 0
+            self.context = ChatContext()
+
+    # Drops the oldest turn; returns the bytes freed
+    def trim(self):
+        with self.lock:
+            return self._drop_oldest() if self.turns else 0
+
+    def _drop_oldest(self):
+        _, size = self.turns.popleft()
+        self.bytes -= size
+        return size
+
+
+# Server-wide limit on the chat history held by all sessions together
+class HistoryBudget:
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.sessions = weakref.WeakSet()
+        self.trimmed = 0
+        self.lock = threading.Lock()
+
+    def new_session(self, max_turns=50, max_bytes=256 * 1024):
+        session = ChatSession(max_turns, max_bytes)
+        with self.lock:
+            self.sessions.add(session)
+        return session
+
+    def enforce(self):
+        with self.lock:
+            sessions = list(self.sessions)
+            total = sum(s.bytes for s in sessions)
+            if self.max_bytes is None or total <= self.max_bytes:
+                return
+            # Oldest turn of whichever session currently holds the most
+            while total > self.max_bytes:
+                largest = max(sessions, key=lambda s: s.bytes)
+                if not largest.turns:
+                    return
+                total -= largest.trim()
+                self.trimmed += 1
+
+    def stats(self):
+        with self.lock:
+            sessions = list(self.sessions)
+            return {
+                "sessions": len(sessions),
+                "turns": sum(len(s.turns) for s in sessions),
+                "bytes": sum(s.bytes for s in sessions),
+                "max_bytes": self.max_bytes,
+                "trimmed_turns": self.trimmed,
+            }
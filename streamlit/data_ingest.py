@@ -0,0 +1,227 @@
+import json
+import mmap
+import os
+import pickle
+import struct
+import sys
+from array import array
+
+from sprint_data import (
+    DATE_COLUMNS, SPRINT_COLUMNS, SPRINT_TYPECODES, Member, SprintRange, SprintStore, SprintTable, Team,
+    WorkItem, date_to_ordinal, team_from_dict,
+)
+
+# Streaming ingest of tracker exports and mmap-able on-disk snapshots.
+#
+# Exports are read one team at a time, either as NDJSON (one team object per
+# line, .ndjson / .jsonl) or as the usual {"teams": [...]} document, so the
+# whole nested tree is never held in memory. Sprints go into one columnar
+# SprintTable. A snapshot stores the same store in a binary file whose sprint
+# columns are mapped straight from disk on the next start.
+
+CHUNK_SIZE = 1 << 20
+NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+
+# Bumped whenever the column layout changes, so older snapshots are rebuilt
+SNAPSHOT_MAGIC = b"SPRSNAP2"
+# magic, source data file size and mtime_ns (0, 0 if unknown), metadata length
+SNAPSHOT_HEADER = struct.Struct("<8sQQQ")
+
+
+def iter_team_dicts(path, chunk_size=CHUNK_SIZE):
+    if path.endswith(NDJSON_SUFFIXES):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        return
+    try:
+        import ijson
+    except ImportError:
+        with open(path, "r", encoding="utf-8") as f:
+            yield from iter_teams_array(f, chunk_size)
+        return
+    with open(path, "rb") as f:
+        yield from ijson.items(f, "teams.item", use_float=True)
+
+
+# Fallback when ijson is not installed. Walks the top-level object, skipping
+# the values of other keys, and decodes the items of its "teams" array one by
+# one with raw_decode. The file is read in chunks and only the unparsed tail is
+# kept in memory.
+def iter_teams_array(f, chunk_size=CHUNK_SIZE):
+    decoder = json.JSONDecoder()
+    buf, pos, eof = "", 0, False
+
+    def fill():
+        nonlocal buf, pos, eof
+        chunk = f.read(chunk_size)
+        buf, pos, eof = buf[pos:] + chunk, 0, not chunk
+
+    def skip_whitespace():
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n":
+                pos += 1
+            if pos < len(buf) or eof:
+                return
+            fill()
+
+    def decode():
+        nonlocal pos
+        skip_whitespace()
+        while True:
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+            except ValueError:
+                if eof:
+                    raise
+                fill()
+                continue
+            # A value ending at the end of the buffer (e.g. a number) may go on
+            # in the next chunk
+            if end == len(buf) and not eof:
+                fill()
+                continue
+            pos = end
+            return value
+
+    def expect(chars):
+        nonlocal pos
+        skip_whitespace()
+        if pos >= len(buf) or buf[pos] not in chars:
+            found = repr(buf[pos]) if pos < len(buf) else "end of file"
+            raise ValueError(f"Expected one of {chars!r} in data file, found {found}")
+        pos += 1
+        return buf[pos - 1]
+
+    expect("{")
+    skip_whitespace()
+    if buf[pos:pos + 1] == "}":
+        raise ValueError('No "teams" array found in data file')
+    while True:
+        skip_whitespace()
+        key = decode()
+        expect(":")
+        if key == "teams":
+            expect("[")
+            break
+        decode()
+        if expect(",}") == "}":
+            raise ValueError('No "teams" array found in data file')
+    skip_whitespace()
+    if buf[pos:pos + 1] == "]":
+        return
+    while True:
+        yield decode()
+        if expect(",]") == "]":
+            return
+
+
+def load_store_streaming(path):
+    table = SprintTable()
+    return SprintStore(team_from_dict(d, table) for d in iter_team_dicts(path))
+
+
+def source_signature(path):
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+
+def save_snapshot(store, path, source=None):
+    columns = {name: array(SPRINT_TYPECODES[name]) for name in SPRINT_COLUMNS}
+    teams = []
+    for team in store.teams:
+        start = len(columns["sprint_id"])
+        if isinstance(team.sprints, SprintRange):
+            source_columns = team.sprints.table.columns
+            for name in SPRINT_COLUMNS:
+                columns[name].extend(source_columns[name][team.sprints.start:team.sprints.stop])
+        else:
+            for s in team.sprints:
+                for name in SPRINT_COLUMNS:
+                    value = getattr(s, name)
+                    columns[name].append(date_to_ordinal(value) if name in DATE_COLUMNS else value)
+        teams.append((
+            team.team_name,
+            [(m.name, m.role) for m in team.members],
+            (start, len(columns["sprint_id"])),
+            [work_item_tuple(w) for w in team.user_stories],
+            [work_item_tuple(w) for w in team.bugs],
+        ))
+    meta = pickle.dumps({
+        "byteorder": sys.byteorder,
+        "rows": len(columns["sprint_id"]),
+        "teams": teams,
+    }, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, *(source or (0, 0)), len(meta)))
+        f.write(meta)
+        f.write(b"\0" * (-f.tell() % 8))
+        for name in SPRINT_COLUMNS:
+            columns[name].tofile(f)
+    os.replace(tmp_path, path)
+
+
+def work_item_tuple(w):
+    return w.id, w.title, w.assigned_to, w.status, w.opened_date, w.cycle_time_days, w.work_item_type
+
+
+def read_snapshot_header(f):
+    magic, size, mtime_ns, meta_len = SNAPSHOT_HEADER.unpack(f.read(SNAPSHOT_HEADER.size))
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError("Not a sprint data snapshot")
+    return (size, mtime_ns), meta_len
+
+
+# Snapshots are trusted local files written by save_snapshot (they contain pickle)
+def load_snapshot(path):
+    with open(path, "rb") as f:
+        _, meta_len = read_snapshot_header(f)
+        meta = pickle.loads(f.read(meta_len))
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if meta["byteorder"] != sys.byteorder:
+        raise ValueError("Snapshot was written on a machine with a different byte order")
+    offset = SNAPSHOT_HEADER.size + meta_len
+    offset += -offset % 8
+    view = memoryview(mm)
+    rows = meta["rows"]
+    columns = {}
+    for name in SPRINT_COLUMNS:
+        typecode = SPRINT_TYPECODES[name]
+        size = array(typecode).itemsize * rows
+        columns[name] = view[offset:offset + size].cast(typecode)
+        offset += size
+    table = SprintTable(columns)
+    return SprintStore(
+        Team(
+            name,
+            [Member(*m) for m in members],
+            SprintRange(table, start, stop),
+            [WorkItem(*w) for w in stories],
+            [WorkItem(*w) for w in bugs],
+        )
+        for name, members, (start, stop), stories, bugs in meta["teams"]
+    )
+
+
+def snapshot_source(path):
+    with open(path, "rb") as f:
+        return read_snapshot_header(f)[0]
+
+
+# Loads from the snapshot when it was written from the current data file,
+# otherwise streams the export and (re)writes the snapshot
+def load_store(path, snapshot_path=None):
+    if snapshot_path:
+        source = source_signature(path)
+        try:
+            if snapshot_source(snapshot_path) == source:
+                return load_snapshot(snapshot_path)
+        except (OSError, ValueError, pickle.UnpicklingError, struct.error):
+            pass
+    store = load_store_streaming(path)
+    if snapshot_path:
+        save_snapshot(store, snapshot_path, source)
+    return store
@@ -0,0 +1,159 @@
+import json
+import os
+import threading
+from collections import deque
+
+from data_ingest import NDJSON_SUFFIXES, load_store, source_signature
+from sprint_data import name_key, team_from_dict
+
+# Hot reload of sprint data.
+#
+# A background thread polls the data file and an optional drop directory of
+# delta files. Changes are applied to a copy of the current SprintStore, which
+# is then swapped in with a single reference assignment: a request that read
+# `refresher.store` once keeps a consistent snapshot for its whole run.
+# Subscribers are told which teams changed so they can drop only those cached
+# answers, charts and reports.
+#
+# Delta files are applied in name order and then moved to `<drop_dir>/applied`:
+#   *.json            {"teams": [<team>, ...], "removed_teams": ["Team X", ...]}
+#   *.ndjson/*.jsonl  one <team> object per line
+# A <team> replaces the team with the same name or adds a new one. A change to
+# the data file itself reloads it in full and replaces any applied deltas.
+# Deltas are only moved once the new store is swapped in; a delta that cannot
+# be parsed is moved to `<drop_dir>/failed` so it does not block later ones.
+
+APPLIED_DIR = "applied"
+FAILED_DIR = "failed"
+
+
+def team_fingerprint(team):
+    return tuple(team.members), tuple(team.sprints), tuple(team.user_stories), tuple(team.bugs)
+
+
+def changed_team_names(old, new):
+    names = {t.team_name for t in old.teams} ^ {t.team_name for t in new.teams}
+    for team in new.teams:
+        previous = old.get_team(team.team_name)
+        if previous is not None and team_fingerprint(previous) != team_fingerprint(team):
+            names.add(team.team_name)
+    return names
+
+
+# (teams, removed team names) of a delta file
+def read_delta(path):
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith(NDJSON_SUFFIXES):
+            upserts, removals = [json.loads(line) for line in f if line.strip()], []
+        else:
+            delta = json.load(f)
+            upserts, removals = delta.get("teams", []), delta.get("removed_teams", [])
+    return [team_from_dict(d) for d in upserts], [str(name) for name in removals]
+
+
+class DataRefresher:
+    def __init__(self, path, snapshot_path=None, drop_dir=None, poll_interval=2.0):
+        self.path = path
+        self.snapshot_path = snapshot_path
+        self.drop_dir = drop_dir
+        self.poll_interval = poll_interval
+        self.source = source_signature(path)
+        self.store = load_store(path, snapshot_path)
+        self.listeners = []
+        self.last_error = None
+        self.failed_deltas = deque(maxlen=100)  # (file name, error) of quarantined deltas
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread = None
+        if poll_interval > 0:
+            self.thread = threading.Thread(target=self._run, name="data-refresh", daemon=True)
+            self.thread.start()
+
+    # callback(changed_team_names, store) runs on the refresh thread after a swap
+    def subscribe(self, callback):
+        self.listeners.append(callback)
+
+    def stop(self):
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+
+    def _run(self):
+        while not self.stopped.wait(self.poll_interval):
+            try:
+                self.refresh()
+                self.last_error = None
+            except Exception as e:
+                # Keep serving the last good snapshot
+                self.last_error = e
+
+    def pending_deltas(self):
+        if not self.drop_dir or not os.path.isdir(self.drop_dir):
+            return []
+        return sorted(
+            os.path.join(self.drop_dir, name) for name in os.listdir(self.drop_dir)
+            if name.endswith((".json",) + NDJSON_SUFFIXES)
+        )
+
+    # Parsed deltas in name order; unreadable files are quarantined
+    def read_pending_deltas(self):
+        deltas = []
+        for delta_path in self.pending_deltas():
+            try:
+                deltas.append((delta_path, read_delta(delta_path)))
+            except (ValueError, KeyError, TypeError, AttributeError) as e:
+                self.failed_deltas.append((os.path.basename(delta_path), f"{type(e).__name__}: {e}"))
+                self.move_delta(delta_path, FAILED_DIR)
+        return deltas
+
+    def move_delta(self, delta_path, subdir):
+        target_dir = os.path.join(self.drop_dir, subdir)
+        os.makedirs(target_dir, exist_ok=True)
+        os.replace(delta_path, os.path.join(target_dir, os.path.basename(delta_path)))
+
+    # Returns the set of changed team names (empty if nothing was swapped in)
+    def refresh(self):
+        with self.lock:
+            current = self.store
+            version = current.version + 1
+            new_store, changed = None, set()
+            source = source_signature(self.path)
+            if source != self.source:
+                new_store = load_store(self.path, self.snapshot_path)
+                changed = changed_team_names(current, new_store)
+                new_store.version = version
+                # Unchanged teams keep their version so their cached answers stay valid
+                for team in new_store.teams:
+                    key = name_key(team.team_name)
+                    new_store.team_versions[key] = (
+                        version if team.team_name in changed else current.team_versions.get(key, version)
+                    )
+            deltas = self.read_pending_deltas()
+            if deltas and new_store is None:
+                new_store = current.copy(version)
+            for _, delta in deltas:
+                changed |= self.apply_delta(new_store, delta)
+            if changed:
+                self.store = new_store
+            # Only now is the data file and every delta reflected in self.store
+            self.source = source
+            for delta_path, _ in deltas:
+                self.move_delta(delta_path, APPLIED_DIR)
+        if not changed:
+            return changed
+        for callback in self.listeners:
+            callback(changed, new_store)
+        return changed
+
+    def apply_delta(self, store, delta):
+        upserts, removals = delta
+        changed = set()
+        for team in upserts:
+            store.upsert_team(team)
+            changed.add(team.team_name)
+        for name in removals:
+            team = store.get_team(name)
+            if team is not None:
+                store.remove_team(name)
+                changed.add(team.team_name)
+        return changed
@@ -0,0 +1,138 @@
+import re
+from dataclasses import dataclass, field
+
+TEAM = "team"
+STORY = "story"
+BUG = "bug"
+
+# Work item IDs of any tracker prefix ("US-101", "BUG-201", "OPS-7"), matched
+# on lower-case text; shared with intent_router and chat_session
+WORK_ITEM_ID_PATTERN = r"\b[a-z][a-z0-9]*-\d+\b"
+# One pass over the query yields work item IDs and words
+TOKEN_PATTERN = re.compile(rf"(?P<id>{WORK_ITEM_ID_PATTERN})|[a-z0-9]+")
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Trie node key marking the end of a team name
+END = None
+
+
+def name_words(name):
+    return WORD_PATTERN.findall(name.lower())
+
+
+def copy_trie(node):
+    return {key: child if key is END else copy_trie(child) for key, child in node.items()}
+
+
+@dataclass(slots=True, frozen=True)
+class Entity:
+    kind: str
+    text: str
+    start: int
+    end: int
+    record: object
+    team: object
+
+
+@dataclass(slots=True)
+class Entities:
+    teams: list = field(default_factory=list)
+    stories: list = field(default_factory=list)
+    bugs: list = field(default_factory=list)
+
+    @property
+    def team(self):
+        return self.teams[0] if self.teams else None
+
+    @property
+    def story(self):
+        return self.stories[0] if self.stories else None
+
+    @property
+    def bug(self):
+        return self.bugs[0] if self.bugs else None
+
+
+# Finds every team name and work item ID in a query in a single left-to-right
+# pass. Team names live in a word trie (longest match wins); IDs resolve through
+# the store's `stories_by_id` / `bugs_by_id` dicts, which the extractor shares
+# rather than copies. Per-query cost depends on the query length and the
+# longest team name, not on how many teams or stories exist.
+class EntityExtractor:
+    def __init__(self, stories_by_id, bugs_by_id):
+        self.trie = {}
+        self.stories_by_id = stories_by_id
+        self.bugs_by_id = bugs_by_id
+
+    # Copy over new ID indexes; trie nodes are copied, Team records are shared
+    def copy(self, stories_by_id, bugs_by_id):
+        clone = EntityExtractor(stories_by_id, bugs_by_id)
+        clone.trie = copy_trie(self.trie)
+        return clone
+
+    def add_team(self, team):
+        node = self.trie
+        for word in name_words(team.team_name):
+            node = node.setdefault(word, {})
+        node[END] = team
+
+    def remove_team(self, team):
+        path = [self.trie]
+        for word in name_words(team.team_name):
+            node = path[-1].get(word)
+            if node is None:
+                return
+            path.append(node)
+        if path[-1].get(END) is not team:
+            return
+        del path[-1][END]
+        # Prune branches that no longer lead to any name
+        for parent, word, node in zip(reversed(path[:-1]), reversed(name_words(team.team_name)),
+                                      reversed(path[1:])):
+            if node:
+                break
+            del parent[word]
+
+    def extract(self, text):
+        entities = Entities()
+        # (word, start, end); word is None for a known work item ID, which
+        # ends any team name. Unknown IDs ("alpha-2") are matched as words.
+        tokens = []
+        for token in TOKEN_PATTERN.finditer(text.lower()):
+            work_item_id = token.group("id")
+            if work_item_id is None:
+                tokens.append((token.group(), token.start(), token.end()))
+            elif self._add_work_item(entities, work_item_id, token.start(), token.end(), text):
+                tokens.append((None, token.start(), token.end()))
+            else:
+                tokens.extend((word.group(), token.start() + word.start(), token.start() + word.end())
+                              for word in WORD_PATTERN.finditer(work_item_id))
+        i = 0
+        while i < len(tokens):
+            match, match_end = None, i
+            node = self.trie
+            for j in range(i, len(tokens)):
+                word = tokens[j][0]
+                node = node.get(word) if word is not None else None
+                if node is None:
+                    break
+                if END in node:
+                    match, match_end = node[END], j
+            if match is None:
+                i += 1
+                continue
+            start, end = tokens[i][1], tokens[match_end][2]
+            entities.teams.append(Entity(TEAM, text[start:end], start, end, match, match))
+            i = match_end + 1
+        return entities
+
+    # Adds the story or bug with this ID; False when neither index has it
+    def _add_work_item(self, entities, work_item_id, start, end, text):
+        for kind, index, found in ((STORY, self.stories_by_id, entities.stories),
+                                   (BUG, self.bugs_by_id, entities.bugs)):
+            match = index.get(work_item_id)
+            if match is not None:
+                record, team = match
+                found.append(Entity(kind, text[start:end], start, end, record, team))
+                return True
+        return False
@@ -0,0 +1,110 @@
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+
+def available_cpus():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def configure_torch_threads(num_threads=0):
+    import torch
+
+    num_threads = num_threads or available_cpus()
+    torch.set_num_threads(num_threads)
+    return num_threads
+
+
+# Makes transformers / huggingface_hub use only the local model cache, with no
+# hub requests for updates or telemetry. Must run before they are imported.
+def use_local_model_cache():
+    os.environ["HF_HUB_OFFLINE"] = "1"
+    os.environ["TRANSFORMERS_OFFLINE"] = "1"
+    os.environ["HF_HUB_DISABLE_TELEMETRY"] = "1"
+
+
+# Shared inference worker for the zero-shot pipeline.
+#
+# Sessions call submit() and get a Future back. A single worker thread drains
+# the queue, groups up to `max_batch_size` pending queries (waiting at most
+# `max_wait_ms` for more to arrive) and runs them through the pipeline as one
+# batch, so concurrent users share forward passes instead of queueing behind
+# each other one query at a time.
+class BatchingClassifier:
+    def __init__(self, classifier, max_batch_size=16, max_wait_ms=10):
+        self.classifier = classifier
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000
+        self.pending = queue.Queue()
+        self.closed = False
+        self.worker = threading.Thread(target=self._run, name="intent-inference", daemon=True)
+        self.worker.start()
+
+    def submit(self, text, candidate_labels):
+        if self.closed:
+            raise RuntimeError("inference worker is closed")
+        future = Future()
+        self.pending.put((text, tuple(candidate_labels), future))
+        return future
+
+    # Blocking convenience wrapper with the same result shape as the pipeline
+    def __call__(self, text, candidate_labels, timeout=None):
+        return self.submit(text, candidate_labels).result(timeout)
+
+    def close(self):
+        self.closed = True
+        self.pending.put(None)
+        self.worker.join()
+
+    def _next_batch(self):
+        first = self.pending.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self.pending.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                self.pending.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            # Queries with the same label set go through the pipeline together
+            groups = OrderedDict()
+            for text, labels, future in batch:
+                if future.set_running_or_notify_cancel():
+                    groups.setdefault(labels, []).append((text, future))
+            for labels, items in groups.items():
+                self._classify_group(list(labels), items)
+
+    def _classify_group(self, labels, items):
+        texts = [text for text, _ in items]
+        try:
+            # One (query, hypothesis) pair per label; batch them all into one forward pass
+            results = self.classifier(texts, labels, batch_size=len(texts) * len(labels))
+            if isinstance(results, dict):
+                results = [results]
+        except Exception as e:
+            for _, future in items:
+                future.set_exception(e)
+            return
+        for (_, future), result in zip(items, results):
+            future.set_result(result)
@@ -0,0 +1,250 @@
+import argparse
+import functools
+import gc
+import json
+import multiprocessing
+import os
+import queue
+import signal
+import stat
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from multiprocessing.connection import Client, Listener, wait
+
+import settings
+from inference_engine import BatchingClassifier, available_cpus, configure_torch_threads, use_local_model_cache
+
+# Local intent inference server shared by several app processes.
+#
+# The parent process loads the intent model once, then forks `workers` worker
+# processes. Forked workers share the parent's weight pages copy-on-write;
+# the gc is frozen before forking so collections do not copy them. Each worker
+# accepts connections on one listening socket and batches the queries of all
+# its connections through a BatchingClassifier. Workers that exit are
+# re-forked from the parent, so a crash does not mean reloading the model.
+#
+# App processes use RemoteClassifier, a drop-in for BatchingClassifier, by
+# setting COPILOT_INFERENCE_SERVER_ADDRESS. They never import torch or
+# transformers.
+#
+#   python inference_server.py --address /tmp/copilot-intent.sock --workers 4
+#
+# Requests and replies are JSON messages over multiprocessing.connection, never
+# pickles, so a client cannot make the server run code. A Unix socket is only
+# accessible to its owner; a host:port address requires an authkey
+# (COPILOT_INFERENCE_SERVER_AUTHKEY) so other local users cannot connect.
+
+# Largest request accepted, in bytes
+MAX_MESSAGE_BYTES = 1 << 20
+
+
+class RemoteInferenceError(RuntimeError):
+    pass
+
+
+# "host:port" -> (host, port); anything else is a Unix socket path
+def parse_address(address):
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit() and "/" not in address:
+        return host or "127.0.0.1", int(port)
+    return address
+
+
+def encode_authkey(authkey):
+    return authkey.encode("utf-8") if authkey else None
+
+
+def send_message(conn, message):
+    conn.send_bytes(json.dumps(message).encode("utf-8"))
+
+
+def handle_connection(conn, classifier):
+    with conn:
+        while True:
+            try:
+                data = conn.recv_bytes(MAX_MESSAGE_BYTES)
+            except (EOFError, OSError):
+                return
+            try:
+                request = json.loads(data)
+                if request[0] == "ping":
+                    reply = ("ok", os.getpid())
+                else:
+                    _, text, labels = request
+                    reply = ("ok", classifier(text, labels))
+            except Exception as e:
+                reply = ("error", f"{type(e).__name__}: {e}")
+            try:
+                send_message(conn, reply)
+            except OSError:
+                return
+
+
+def worker_main(listener, classifier, max_batch_size, max_wait_ms, setup=None):
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    if setup is not None:
+        setup()
+    # One throwaway pass so lazy initialisation is not paid by the first real question
+    classifier("warm-up", ["sprint status"])
+    batcher = BatchingClassifier(classifier, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+    while True:
+        try:
+            conn = listener.accept()
+        except (OSError, multiprocessing.AuthenticationError):
+            continue
+        threading.Thread(target=handle_connection, args=(conn, batcher), daemon=True).start()
+
+
+def open_listener(address, authkey=None):
+    address = parse_address(address)
+    if not isinstance(address, str) and not authkey:
+        raise ValueError("a host:port inference server address needs COPILOT_INFERENCE_SERVER_AUTHKEY")
+    if isinstance(address, str) and os.path.exists(address) and stat.S_ISSOCK(os.stat(address).st_mode):
+        os.remove(address)  # left behind by a server that was killed
+    listener = Listener(address, authkey=encode_authkey(authkey), backlog=64)
+    if isinstance(address, str):
+        os.chmod(address, 0o600)
+    return listener
+
+
+# Loads the classifier with `load()` and serves it from `workers` forked
+# processes until SIGTERM / SIGINT. `setup` runs in each worker after the fork.
+def serve(address, load, workers=2, authkey=None, max_batch_size=16, max_wait_ms=10, setup=None, ready=None):
+    classifier = load()
+    listener = open_listener(address, authkey)
+    context = multiprocessing.get_context("fork")
+    args = (listener, classifier, max_batch_size, max_wait_ms, setup)
+
+    def start_worker():
+        process = context.Process(target=worker_main, args=args, name="intent-worker", daemon=True)
+        process.start()
+        return process
+
+    def stop(signum, frame):
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, stop)
+    # Objects allocated so far (the model) stay out of later collections, so the
+    # gc does not write to and un-share their pages in the workers
+    gc.freeze()
+    processes = [start_worker() for _ in range(max(1, workers))]
+    if ready is not None:
+        ready()
+    try:
+        while True:
+            wait([p.sentinel for p in processes])
+            time.sleep(1)  # do not spin if workers fail right after starting
+            processes = [p if p.is_alive() else start_worker() for p in processes]
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        for p in processes:
+            p.terminate()
+        for p in processes:
+            p.join()
+        listener.close()
+
+
+# Client for the inference server with the call signature of
+# BatchingClassifier. Each calling thread borrows one connection from a pool of
+# up to `max_connections`. A connection that fails or times out is dropped. A
+# request that hit a closed connection (server restarted) is retried once on a
+# new one.
+class RemoteClassifier:
+    def __init__(self, address, authkey=None, max_connections=8, timeout=30):
+        self.address = parse_address(address)
+        self.authkey = encode_authkey(authkey)
+        self.timeout = timeout
+        self.idle = queue.LifoQueue()
+        self.slots = threading.BoundedSemaphore(max_connections)
+
+    @contextmanager
+    def connection(self):
+        with self.slots:
+            try:
+                conn = self.idle.get_nowait()
+            except queue.Empty:
+                conn = Client(self.address, authkey=self.authkey)
+            try:
+                yield conn
+            except BaseException:
+                conn.close()
+                raise
+            self.idle.put(conn)
+
+    def request(self, message, timeout=None):
+        timeout = self.timeout if timeout is None else timeout
+        for attempt in range(2):
+            try:
+                with self.connection() as conn:
+                    send_message(conn, message)
+                    if not conn.poll(timeout):
+                        raise TimeoutError(f"no reply from the inference server within {timeout}s")
+                    status, value = json.loads(conn.recv_bytes())
+                break
+            except (EOFError, ConnectionError):
+                if attempt:
+                    raise
+                # The server went away; its other idle connections are dead too
+                self.close()
+        if status == "error":
+            raise RemoteInferenceError(value)
+        return value
+
+    def __call__(self, text, candidate_labels, timeout=None):
+        return self.request(["classify", text, list(candidate_labels)], timeout)
+
+    # PID of the worker that answered
+    def ping(self, timeout=None):
+        return self.request(["ping"], timeout)
+
+    def close(self):
+        while True:
+            try:
+                self.idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+def load_configured_classifier():
+    if settings.MODEL_LOCAL_FILES_ONLY:
+        use_local_model_cache()
+    from intent_models import load_intent_classifier
+
+    return load_intent_classifier(
+        settings.INTENT_MODEL_MODE,
+        backend=settings.INTENT_BACKEND,
+        nli_model=settings.NLI_MODEL,
+        embedding_model=settings.EMBEDDING_MODEL,
+        local_files_only=settings.MODEL_LOCAL_FILES_ONLY,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the intent model to local app processes")
+    parser.add_argument("--address", default=settings.INFERENCE_SERVER_ADDRESS or "/tmp/copilot-intent.sock",
+                        help="Unix socket path or host:port")
+    parser.add_argument("--workers", type=int, default=settings.INFERENCE_SERVER_WORKERS,
+                        help="worker processes (0 = one per CPU core)")
+    args = parser.parse_args(argv)
+    workers = args.workers or available_cpus()
+    # Split the cores between workers instead of every worker using all of them
+    threads = settings.TORCH_NUM_THREADS or max(1, available_cpus() // workers)
+    serve(
+        args.address,
+        load_configured_classifier,
+        workers=workers,
+        authkey=settings.INFERENCE_SERVER_AUTHKEY,
+        max_batch_size=settings.INFERENCE_MAX_BATCH_SIZE,
+        max_wait_ms=settings.INFERENCE_MAX_WAIT_MS,
+        setup=functools.partial(configure_torch_threads, threads),
+        ready=lambda: print(f"Serving intent model on {args.address} with {workers} workers", flush=True),
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
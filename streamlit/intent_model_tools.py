@@ -0,0 +1,119 @@
+import argparse
+import json
+import sys
+
+from intent_models import (
+    DEFAULT_EMBEDDING_MODEL, DEFAULT_NLI_MODEL, EMBEDDING_MODE, NLI_MODE, ONNX_BACKEND, PIPELINE_MODE,
+    PYTORCH_BACKEND, load_intent_classifier,
+)
+from intent_router import INTENT_LABELS
+
+# Offline helpers for the intent model backends:
+#   export  - save a model (PyTorch or ONNX) to a local directory
+#   parity  - check that a faster backend makes the same routing decisions
+#
+#   python intent_model_tools.py export --backend onnx --out models/bart-mnli-onnx
+#   python intent_model_tools.py export --mode embedding --backend onnx --out models/minilm-onnx
+#   python intent_model_tools.py parity --model models/bart-mnli-onnx --backend onnx
+
+CONFIDENCE_THRESHOLD = 0.7
+
+# Fixed query set for parity checks: the UI examples plus phrasings that miss the
+# keyword tier and reach the model
+PARITY_QUERIES = [
+    "What is the sprint status of Team Alpha",
+    "How should Team Alpha's next sprint look like?",
+    "How long has US-101 been open?",
+    "What is the bug progress for Team Gamma?",
+    "Who is working on US-102?",
+    "Which teams do we have?",
+    "Who belongs to Team Beta?",
+    "Is BUG-201 fixed?",
+    "How is Team Beta doing?",
+    "What will Team Beta deliver after this iteration?",
+    "Send me a document summarising Team Alpha",
+    "Tell me a joke",
+]
+
+
+# Embedding mode exports the bare encoder (feature extraction), the others the
+# sequence classification head, matching what intent_models.load_model loads
+def export_model(model_name, out_dir, backend=PYTORCH_BACKEND, mode=PIPELINE_MODE):
+    from transformers import AutoModel, AutoModelForSequenceClassification, AutoTokenizer
+
+    embedding = mode == EMBEDDING_MODE
+    AutoTokenizer.from_pretrained(model_name).save_pretrained(out_dir)
+    if backend == PYTORCH_BACKEND:
+        model_class = AutoModel if embedding else AutoModelForSequenceClassification
+        model_class.from_pretrained(model_name).save_pretrained(out_dir)
+        return
+    from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTModelForSequenceClassification
+
+    model_class = ORTModelForFeatureExtraction if embedding else ORTModelForSequenceClassification
+    model_class.from_pretrained(model_name, export=True).save_pretrained(out_dir)
+
+
+def routing_decision(result, threshold=CONFIDENCE_THRESHOLD):
+    label, score = result["labels"][0], result["scores"][0]
+    return label if score >= threshold else None
+
+
+# Runs both classifiers over `queries` and reports every query whose routing
+# decision (top label, or "unsure" below the threshold) differs
+def parity_check(reference, candidate, queries=PARITY_QUERIES, labels=INTENT_LABELS,
+                 threshold=CONFIDENCE_THRESHOLD):
+    rows = []
+    for query in queries:
+        expected = reference(query, labels)
+        actual = candidate(query, labels)
+        rows.append({
+            "query": query,
+            "reference": [expected["labels"][0], round(expected["scores"][0], 4)],
+            "candidate": [actual["labels"][0], round(actual["scores"][0], 4)],
+            "score_delta": round(abs(expected["scores"][0] - actual["scores"][0]), 4),
+            "same_decision": routing_decision(expected, threshold) == routing_decision(actual, threshold),
+        })
+    return {
+        "queries": len(rows),
+        "mismatches": sum(not row["same_decision"] for row in rows),
+        "max_score_delta": max((row["score_delta"] for row in rows), default=0.0),
+        "results": rows,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export and check intent model backends")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="save a model to a local directory")
+    export.add_argument("--mode", choices=[PIPELINE_MODE, NLI_MODE, EMBEDDING_MODE], default=PIPELINE_MODE)
+    export.add_argument("--model", help=f"default: {DEFAULT_NLI_MODEL}, or {DEFAULT_EMBEDDING_MODEL} "
+                                        f"for --mode {EMBEDDING_MODE}")
+    # The int8 backend quantizes at load time, so it loads a "pytorch" export
+    export.add_argument("--backend", choices=[PYTORCH_BACKEND, ONNX_BACKEND], default=PYTORCH_BACKEND)
+    export.add_argument("--out", required=True)
+
+    parity = commands.add_parser("parity", help="compare a backend with the reference pipeline")
+    parity.add_argument("--model", required=True, help="model id or local directory to check")
+    parity.add_argument("--mode", default=PIPELINE_MODE)
+    parity.add_argument("--backend", default=PYTORCH_BACKEND)
+    parity.add_argument("--reference-model", default=DEFAULT_NLI_MODEL)
+    parity.add_argument("--threshold", type=float, default=CONFIDENCE_THRESHOLD)
+
+    args = parser.parse_args(argv)
+    if args.command == "export":
+        model = args.model or (DEFAULT_EMBEDDING_MODEL if args.mode == EMBEDDING_MODE else DEFAULT_NLI_MODEL)
+        export_model(model, args.out, args.backend, args.mode)
+        return 0
+
+    reference = load_intent_classifier(PIPELINE_MODE, PYTORCH_BACKEND, nli_model=args.reference_model)
+    candidate = load_intent_classifier(args.mode, args.backend, nli_model=args.model,
+                                       embedding_model=args.model)
+    report = parity_check(reference, candidate, threshold=args.threshold)
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return 1 if report["mismatches"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
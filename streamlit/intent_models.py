@@ -0,0 +1,206 @@
+import torch
+from transformers import AutoModel, AutoModelForSequenceClassification, AutoTokenizer, pipeline
+
+from intent_router import INTENT_LABELS
+
+# Intent classifiers with the same call signature and result shape as the
+# Hugging Face zero-shot pipeline: classifier(texts, candidate_labels) returns
+# {"sequence", "labels", "scores"} (a list of them for a list of texts), with
+# labels sorted by descending score.
+
+PIPELINE_MODE = "pipeline"
+NLI_MODE = "nli"
+EMBEDDING_MODE = "embedding"
+
+# How the model weights run on CPU
+PYTORCH_BACKEND = "pytorch"
+INT8_BACKEND = "int8"
+ONNX_BACKEND = "onnx"
+
+DEFAULT_NLI_MODEL = "facebook/bart-large-mnli"
+DEFAULT_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+HYPOTHESIS_TEMPLATE = "This example is {}."
+
+# Example phrasings per intent; the embedding classifier averages them into one
+# prototype vector per label
+LABEL_EXAMPLES = {
+    "sprint status": [
+        "What is the sprint status of Team Alpha",
+        "How is the current sprint going?",
+        "Give me the latest sprint overview",
+    ],
+    "user story assignment": [
+        "Who is assigned to US-101?",
+        "Who owns this user story?",
+        "Which developer is working on US-102",
+    ],
+    "user story duration": [
+        "How long has US-101 been open?",
+        "How many days has this story been open",
+        "What is the age of user story US-102",
+    ],
+    "bug tracking": [
+        "What is the bug progress for Team Gamma?",
+        "How many open bugs does the team have",
+        "Show me the bug tracker",
+    ],
+    "sprint prediction": [
+        "How should Team Alpha's next sprint look like?",
+        "Forecast the next sprint velocity",
+        "Predict the upcoming sprint",
+    ],
+    "team members": [
+        "Who is in Team Beta?",
+        "List the members of the team",
+        "Show me the team lineup",
+    ],
+    "list teams": [
+        "List all teams",
+        "Which teams are available?",
+        "Show me the teams",
+    ],
+    "export report": [
+        "Export the sprint report as PDF",
+        "Download a report for Team Alpha",
+        "Generate the weekly report",
+    ],
+}
+
+
+def ranked_result(sequence, labels, scores):
+    order = sorted(range(len(labels)), key=lambda i: scores[i], reverse=True)
+    return {
+        "sequence": sequence,
+        "labels": [labels[i] for i in order],
+        "scores": [float(scores[i]) for i in order],
+    }
+
+
+# Cross-encoder NLI classifier that tokenizes each "This example is {label}."
+# hypothesis once and reuses the ids for every query. Scores match the
+# zero-shot pipeline: softmax of the entailment logits across labels.
+class PrecomputedNLIClassifier:
+    def __init__(self, model, tokenizer, labels=INTENT_LABELS, hypothesis_template=HYPOTHESIS_TEMPLATE):
+        self.model = model
+        self.tokenizer = tokenizer
+        self.hypothesis_template = hypothesis_template
+        label2id = {k.lower(): v for k, v in self.model.config.label2id.items()}
+        self.entailment_id = next((v for k, v in label2id.items() if k.startswith("entail")), -1)
+        self.contradiction_id = next((v for k, v in label2id.items() if k.startswith("contra")), 0)
+        self.hypothesis_ids = {}
+        for label in labels:
+            self.encode_hypothesis(label)
+
+    def encode_hypothesis(self, label):
+        ids = self.hypothesis_ids.get(label)
+        if ids is None:
+            hypothesis = self.hypothesis_template.format(label)
+            ids = self.tokenizer(hypothesis, add_special_tokens=False)["input_ids"]
+            self.hypothesis_ids[label] = ids
+        return ids
+
+    def encode_pair(self, premise_ids, hypothesis_ids):
+        # Truncate the query, never the hypothesis, like truncation="only_first"
+        budget = (self.tokenizer.model_max_length
+                  - self.tokenizer.num_special_tokens_to_add(pair=True) - len(hypothesis_ids))
+        premise_ids = premise_ids[:budget]
+        pair = {"input_ids": self.tokenizer.build_inputs_with_special_tokens(premise_ids, hypothesis_ids)}
+        if "token_type_ids" in self.tokenizer.model_input_names:
+            pair["token_type_ids"] = self.tokenizer.create_token_type_ids_from_sequences(
+                premise_ids, hypothesis_ids)
+        return pair
+
+    @torch.inference_mode()
+    def __call__(self, sequences, candidate_labels, batch_size=None):
+        single = isinstance(sequences, str)
+        texts = [sequences] if single else list(sequences)
+        labels = list(candidate_labels)
+        hypotheses = [self.encode_hypothesis(label) for label in labels]
+        premises = self.tokenizer(texts, add_special_tokens=False)["input_ids"]
+        pairs = [self.encode_pair(p, h) for p in premises for h in hypotheses]
+        inputs = self.tokenizer.pad(pairs, return_tensors="pt")
+        logits = self.model(**inputs).logits.reshape(len(texts), len(labels), -1)
+        if len(labels) == 1:
+            pair = logits[..., [self.contradiction_id, self.entailment_id]]
+            scores = pair.softmax(-1)[..., 1]
+        else:
+            scores = logits[..., self.entailment_id].softmax(-1)
+        results = [ranked_result(t, labels, s.tolist()) for t, s in zip(texts, scores)]
+        return results[0] if single else results
+
+
+# Bi-encoder classifier: label prototypes are embedded once, so each query costs
+# one encoder pass and a dot product instead of one NLI pass per label.
+# Cosine similarities are turned into a distribution with a softmax at
+# `temperature`, which keeps scores comparable to the 0.7 confidence cut-off.
+class EmbeddingIntentClassifier:
+    def __init__(self, model, tokenizer, labels=INTENT_LABELS, label_examples=LABEL_EXAMPLES,
+                 temperature=0.05):
+        self.model = model
+        self.tokenizer = tokenizer
+        self.label_examples = label_examples
+        self.temperature = temperature
+        self.label_embeddings = {}
+        for label in labels:
+            self.embed_label(label)
+
+    @torch.inference_mode()
+    def encode(self, texts):
+        inputs = self.tokenizer(texts, padding=True, truncation=True, return_tensors="pt")
+        hidden = self.model(**inputs).last_hidden_state
+        mask = inputs["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+        pooled = (hidden * mask).sum(1) / mask.sum(1).clamp(min=1e-9)
+        return torch.nn.functional.normalize(pooled, dim=-1)
+
+    def embed_label(self, label):
+        embedding = self.label_embeddings.get(label)
+        if embedding is None:
+            examples = self.label_examples.get(label) or [HYPOTHESIS_TEMPLATE.format(label)]
+            embedding = torch.nn.functional.normalize(self.encode(examples).mean(0), dim=-1)
+            self.label_embeddings[label] = embedding
+        return embedding
+
+    def __call__(self, sequences, candidate_labels, batch_size=None):
+        single = isinstance(sequences, str)
+        texts = [sequences] if single else list(sequences)
+        labels = list(candidate_labels)
+        label_matrix = torch.stack([self.embed_label(label) for label in labels])
+        similarities = self.encode(texts) @ label_matrix.T
+        scores = (similarities / self.temperature).softmax(-1)
+        results = [ranked_result(t, labels, s.tolist()) for t, s in zip(texts, scores)]
+        return results[0] if single else results
+
+
+# Load a model and tokenizer for `backend`. `model_name` may be a hub id or a
+# local directory (see intent_model_tools.py export); with local_files_only the
+# hub is never contacted. The onnx backend expects an already exported model.
+def load_model(model_name, backend=PYTORCH_BACKEND, embedding=False, local_files_only=False):
+    tokenizer = AutoTokenizer.from_pretrained(model_name, local_files_only=local_files_only)
+    if backend == ONNX_BACKEND:
+        from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTModelForSequenceClassification
+
+        model_class = ORTModelForFeatureExtraction if embedding else ORTModelForSequenceClassification
+        return model_class.from_pretrained(model_name, local_files_only=local_files_only), tokenizer
+    if backend not in (PYTORCH_BACKEND, INT8_BACKEND):
+        raise ValueError(f"Unknown intent model backend: {backend!r}")
+    model_class = AutoModel if embedding else AutoModelForSequenceClassification
+    model = model_class.from_pretrained(model_name, local_files_only=local_files_only)
+    model.eval()
+    if backend == INT8_BACKEND:
+        # Dynamic int8 quantization of the Linear layers; activations stay fp32
+        model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return model, tokenizer
+
+
+def load_intent_classifier(mode=PIPELINE_MODE, backend=PYTORCH_BACKEND, nli_model=DEFAULT_NLI_MODEL,
+                           embedding_model=DEFAULT_EMBEDDING_MODEL, local_files_only=False):
+    if mode == EMBEDDING_MODE:
+        model, tokenizer = load_model(embedding_model, backend, embedding=True,
+                                      local_files_only=local_files_only)
+        return EmbeddingIntentClassifier(model, tokenizer)
+    if mode not in (PIPELINE_MODE, NLI_MODE):
+        raise ValueError(f"Unknown intent model mode: {mode!r}")
+    model, tokenizer = load_model(nli_model, backend, local_files_only=local_files_only)
+    if mode == NLI_MODE:
+        return PrecomputedNLIClassifier(model, tokenizer)
+    return pipeline("zero-shot-classification", model=model, tokenizer=tokenizer, device=-1)
@@ -0,0 +1,75 @@
+import re
+
+from entity_extractor import WORK_ITEM_ID_PATTERN
+
+# Intents understood by the chatbot (also the zero-shot candidate labels)
+INTENT_LABELS = [
+    "sprint status", "user story assignment", "user story duration", "bug tracking",
+    "sprint prediction", "team members", "list teams", "export report"
+]
+
+KEYWORD_TIER = "keyword"
+ZERO_SHOT_TIER = "zero-shot"
+
+# Score reported when the keyword tier answers; above the 0.7 confidence cut-off
+KEYWORD_CONFIDENCE = 0.95
+
+# Each intent matches if all patterns of any one of its rules are found in the query
+KEYWORD_RULES = {
+    "sprint status": [
+        [r"\bsprint status\b"],
+        [r"\bstatus of\b", r"\bteam\b"],
+        [r"\b(?:current|latest|this) sprint\b"],
+        [r"\bsprint (?:overview|summary|progress)\b"],
+    ],
+    "sprint prediction": [
+        [r"\bnext sprint\b"],
+        [r"\bupcoming sprint\b"],
+        [r"\b(?:forecast|predict|prediction)\b(?! to miss)"],
+    ],
+    "user story duration": [
+        [WORK_ITEM_ID_PATTERN, r"\b(?:how long|been open|open for|days|duration|age)\b"],
+    ],
+    "user story assignment": [
+        [WORK_ITEM_ID_PATTERN, r"\b(?:assigned|assignee|owner|owns|working on)\b"],
+    ],
+    "bug tracking": [
+        [r"\b(?:bugs?|defects?)\b(?! ?-\d)"],
+    ],
+    "team members": [
+        [r"\b(?:members|lineup|line-up|roster)\b"],
+        [r"\bwho (?:is|are|works) (?:in|on)\b"],
+    ],
+    "list teams": [
+        [r"\b(?:list|show|which|what) (?:all )?(?:the )?teams\b"],
+        [r"\b(?:available|all) teams\b"],
+        [r"\bteams\b", r"\b(?:high[- ]risk|at risk|ended|ending|this week|miss|missing)\b"],
+    ],
+    "export report": [
+        [r"\b(?:export|pdf|download)\b"],
+    ],
+}
+
+COMPILED_RULES = {
+    intent: [[re.compile(p) for p in rule] for rule in rules]
+    for intent, rules in KEYWORD_RULES.items()
+}
+
+
+def keyword_intents(user_input):
+    text = user_input.lower()
+    return [
+        intent for intent, rules in COMPILED_RULES.items()
+        if any(all(p.search(text) for p in rule) for rule in rules)
+    ]
+
+
+# Tiered intent detection: cheap keyword rules first, the zero-shot model only
+# when the rules match no intent or disagree. `fallback` is called with the
+# query and the candidate labels and must return (label, score).
+def route_intent(user_input, fallback):
+    matches = keyword_intents(user_input)
+    if len(matches) == 1:
+        return matches[0], KEYWORD_CONFIDENCE, KEYWORD_TIER
+    label, score = fallback(user_input, INTENT_LABELS)
+    return label, score, ZERO_SHOT_TIER
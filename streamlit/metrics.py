@@ -0,0 +1,255 @@
+import bisect
+import functools
+import threading
+import time
+from contextlib import nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import settings
+
+# In-process metrics for the hot path, exported in the Prometheus text format.
+#
+# Metrics are created from a Registry. A disabled registry hands out one shared
+# no-op metric instead, so instrumented code costs a single method call when
+# COPILOT_METRICS_ENABLED is off. Metrics only cover this process: PDFs
+# rendered in report worker processes are counted by the app as a batch.
+#
+#   STAGE_SECONDS.observe(0.012, stage="entities")
+#   with STAGE_SECONDS.time(stage="model"):
+#       ...
+#   @STAGE_SECONDS.timed(stage="pdf")
+#   def export_pdf_report(team): ...
+
+# Latency buckets in seconds, from sub-millisecond lookups to model inference
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+CONFIDENCE_BUCKETS = (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 0.95, 1.0)
+
+
+def label_text(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for _, v in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+def format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Timer:
+    __slots__ = ("histogram", "labels", "started")
+
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.started, **self.labels)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels.get(name, "") for name in self.label_names)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def total(self):
+        with self.lock:
+            return sum(self.values.values())
+
+    def snapshot(self):
+        with self.lock:
+            return {",".join(key) or "total": value for key, value in self.values.items()}
+
+    def samples(self):
+        with self.lock:
+            for key, value in sorted(self.values.items()):
+                yield self.name + "_total" + label_text(self.label_names, key), value
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self.values = {}  # label values -> [bucket counts..., +Inf count, sum]
+        self.lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels.get(name, "") for name in self.label_names)
+        i = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            counts = self.values.get(key)
+            if counts is None:
+                counts = self.values[key] = [0] * (len(self.buckets) + 2)
+            counts[i] += 1
+            counts[-1] += value
+
+    def time(self, **labels):
+        return Timer(self, labels)
+
+    # Decorator timing every call of the function
+    def timed(self, **labels):
+        def decorate(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with Timer(self, labels):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def snapshot(self):
+        with self.lock:
+            result = {}
+            for key, counts in self.values.items():
+                count = sum(counts[:-1])
+                result[",".join(key) or "total"] = {
+                    "count": count,
+                    "mean": round(counts[-1] / count, 6) if count else 0.0,
+                    "p50": self._quantile(counts, 0.5),
+                    "p95": self._quantile(counts, 0.95),
+                }
+            return result
+
+    # Upper bound of the bucket holding quantile `q`
+    def _quantile(self, counts, q):
+        total = sum(counts[:-1])
+        seen = 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts[:-1]):
+            seen += count
+            if seen >= q * total:
+                return bound
+        return float("inf")
+
+    def samples(self):
+        with self.lock:
+            for key, counts in sorted(self.values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), counts[:-1]):
+                    cumulative += count
+                    le = (("le", format_value(bound)),)
+                    yield self.name + "_bucket" + label_text(self.label_names, key, le), cumulative
+                yield self.name + "_sum" + label_text(self.label_names, key), counts[-1]
+                yield self.name + "_count" + label_text(self.label_names, key), cumulative
+
+
+# Stands in for every metric of a disabled registry
+class NullMetric:
+    __slots__ = ()
+
+    def inc(self, amount=1, **labels):
+        pass
+
+    def observe(self, value, **labels):
+        pass
+
+    def time(self, **labels):
+        return NULL_TIMER
+
+    # Leaves the function undecorated, so disabled metrics cost nothing
+    def timed(self, **labels):
+        return lambda fn: fn
+
+    def total(self):
+        return 0
+
+
+NULL_METRIC = NullMetric()
+NULL_TIMER = nullcontext()
+
+
+class Registry:
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.metrics = {}
+        self.lock = threading.Lock()
+
+    def counter(self, name, help, labels=()):
+        return self._register(Counter, name, help, labels)
+
+    def histogram(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram, name, help, labels, buckets)
+
+    def _register(self, cls, name, help, *args):
+        if not self.enabled:
+            return NULL_METRIC
+        with self.lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = cls(name, help, *args)
+            return metric
+
+    # Prometheus text exposition format (version 0.0.4)
+    def render(self):
+        lines = []
+        with self.lock:
+            metrics = list(self.metrics.values())
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(f"{name} {format_value(value)}" for name, value in metric.samples())
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self):
+        with self.lock:
+            return {name: metric.snapshot() for name, metric in self.metrics.items()}
+
+
+REGISTRY = Registry(enabled=settings.METRICS_ENABLED)
+
+# Shared hot-path metrics
+STAGE_SECONDS = REGISTRY.histogram(
+    "copilot_stage_seconds", "Time spent per question-handling stage", labels=("stage",))
+QUESTIONS = REGISTRY.counter("copilot_questions", "Questions answered")
+INTENTS = REGISTRY.counter("copilot_intents", "Detected intents by router tier", labels=("intent", "tier"))
+INTENT_CONFIDENCE = REGISTRY.histogram(
+    "copilot_intent_confidence", "Confidence of the detected intent", labels=("tier",), buckets=CONFIDENCE_BUCKETS)
+LOW_CONFIDENCE = REGISTRY.counter(
+    "copilot_low_confidence", "Questions answered with the rephrase fallback (confidence below 0.7)")
+CACHE_LOOKUPS = REGISTRY.counter("copilot_cache_lookups", "Cache lookups by result", labels=("cache", "result"))
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+# Serves GET /metrics from a daemon thread; returns the server
+def start_http_server(port, host="127.0.0.1", registry=REGISTRY):
+    handler = type("Handler", (MetricsHandler,), {"registry": registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
@@ -0,0 +1,144 @@
+import multiprocessing
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import astuple
+from io import BytesIO
+
+from metrics import CACHE_LOOKUPS, STAGE_SECONDS
+from response_cache import MISSING, LRUCache
+from sprint_data import calculate_risk, get_latest_sprint
+
+
+# PDF Export (rendered in memory, returns the PDF bytes)
+@STAGE_SECONDS.timed(stage="pdf")
+def export_pdf_report(team):
+    # Imported here so the app only loads reportlab once a report is exported
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer, pagesize=A4)
+    width, height = A4
+    c.setFont("Helvetica-Bold", 16)
+    c.drawString(50, height - 50, f"DevOps Sprint Report – {team.team_name}")
+    latest = get_latest_sprint(team)
+    text = f"""
+    Sprint ID: {latest.sprint_id}
+    Planned Story Points: {latest.story_points_planned}
+    Completed Story Points: {latest.story_points_completed}
+    Velocity: {latest.velocity}
+    Blockers: {latest.blockers}
+    Bugs Reported: {latest.bugs_reported}
+    Risk Level: {calculate_risk(team)}
+    """
+    c.setFont("Helvetica", 11)
+    y = height - 100
+    for line in text.strip().split("\n"):
+        c.drawString(50, y, line.strip())
+        y -= 20
+    c.showPage()
+    c.save()
+    return buffer.getvalue()
+
+
+def report_file_name(team):
+    return f"{team.team_name}_Sprint_Report.pdf"
+
+
+# A report only changes when the team's latest sprint does
+def report_cache_key(team):
+    return team.team_name, astuple(get_latest_sprint(team))
+
+
+# Renders reports across a process pool and caches finished PDFs per team and
+# latest sprint. Batches smaller than `min_parallel` render in-process, where
+# starting workers would cost more than it saves.
+class ReportEngine:
+    def __init__(self, max_workers=None, cache_size=512, min_parallel=4):
+        self.max_workers = max_workers or None
+        self.min_parallel = min_parallel
+        self.cache = LRUCache(cache_size)
+        self.pool = None
+
+    def executor(self):
+        if self.pool is None:
+            # spawn: the app process holds model threads that must not be forked
+            self.pool = ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+        return self.pool
+
+    def render(self, team):
+        key = report_cache_key(team)
+        pdf = self.cache.get(key)
+        CACHE_LOOKUPS.inc(cache="report", result="miss" if pdf is MISSING else "hit")
+        if pdf is MISSING:
+            pdf = export_pdf_report(team)
+            self.cache.put(key, pdf, tags=[team.team_name])
+        return pdf
+
+    # Yields (team, pdf_bytes, error): cached reports first, the rest as they
+    # finish. A report that fails yields (team, None, exception) instead of
+    # stopping the others. Pool renders are timed as one "pdf_batch" stage,
+    # since per-report timings stay in the worker processes.
+    def render_many(self, teams):
+        missing = []
+        for team in teams:
+            try:
+                pdf = self.cache.get(report_cache_key(team))
+            except Exception as e:  # e.g. a team without sprints
+                yield team, None, e
+                continue
+            if pdf is MISSING:
+                missing.append(team)
+            else:
+                yield team, pdf, None
+        if len(missing) < self.min_parallel:
+            for team in missing:
+                try:
+                    yield team, self.render(team), None
+                except Exception as e:
+                    yield team, None, e
+            return
+        started = time.perf_counter()
+        futures = {self.executor().submit(export_pdf_report, team): team for team in missing}
+        for future in as_completed(futures):
+            team = futures[future]
+            try:
+                pdf = future.result()
+            except BrokenProcessPool as e:
+                self.close()  # a worker died; the next batch starts a new pool
+                yield team, None, e
+                continue
+            except Exception as e:
+                yield team, None, e
+                continue
+            self.cache.put(report_cache_key(team), pdf, tags=[team.team_name])
+            yield team, pdf, None
+        STAGE_SECONDS.observe(time.perf_counter() - started, stage="pdf_batch")
+
+    # All reports in one ZIP, written entry by entry as reports complete.
+    # `progress(done, total)` is called after each one. Returns the archive
+    # and a list of (team, exception) for reports that could not be rendered.
+    def build_zip(self, teams, progress=None):
+        teams = list(teams)
+        failed = []
+        buffer = BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+            for done, (team, pdf, error) in enumerate(self.render_many(teams), start=1):
+                if error is None:
+                    archive.writestr(report_file_name(team), pdf)
+                else:
+                    failed.append((team, error))
+                if progress:
+                    progress(done, len(teams))
+        return buffer.getvalue(), failed
+
+    # Refresher callback: drop reports of changed teams
+    def invalidate_teams(self, team_names, store=None):
+        self.cache.invalidate_tags(team_names)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
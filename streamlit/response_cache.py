@@ -0,0 +1,138 @@
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+# LRU + TTL caches in front of generate_response_with_nlp.
+#
+# Intent results are keyed on the normalized query only (they do not depend on
+# the data). Rendered answers are keyed on the normalized query plus the
+# version of the data they were built from, so a data refresh never serves a
+# stale answer; entries are also tagged with the teams they mention, so the
+# refresher can free the ones for changed teams right away.
+
+MISSING = object()
+
+# Intents whose answers must not be reused (only their intent is cached).
+# Sprint forecasts are deterministic per data version, so none are excluded.
+UNCACHED_INTENTS = set()
+# Answers that depend on today's date (days open, sprints ended this week)
+# include it in the key
+DATE_DEPENDENT_INTENTS = {"user story duration", "list teams"}
+
+
+def normalize_query(text):
+    return re.sub(r"\s+", " ", text.strip().lower()).rstrip("?!. ")
+
+
+def approx_size(value):
+    size = sys.getsizeof(value)
+    if isinstance(value, (tuple, list)):
+        size += sum(sys.getsizeof(v) for v in value)
+    return size
+
+
+class LRUCache:
+    def __init__(self, max_entries=1024, max_bytes=None, ttl_seconds=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.entries = OrderedDict()  # key -> (value, size, expires_at, tags)
+        self.tagged = {}  # tag -> set of keys
+        self.bytes = 0
+        self.lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = self.invalidations = 0
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISSING
+            if entry[2] is not None and entry[2] < time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return MISSING
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, tags=()):
+        size = approx_size(key) + approx_size(value)
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        with self.lock:
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = (value, size, expires_at, tuple(tags))
+            self.bytes += size
+            for tag in tags:
+                self.tagged.setdefault(tag, set()).add(key)
+            while self.entries and (
+                len(self.entries) > self.max_entries
+                or (self.max_bytes is not None and self.bytes > self.max_bytes)
+            ):
+                self._remove(next(iter(self.entries)))
+                self.evictions += 1
+
+    def invalidate_tags(self, tags):
+        with self.lock:
+            for tag in tags:
+                for key in self.tagged.pop(tag, ()):
+                    if key in self.entries:
+                        self._remove(key)
+                        self.invalidations += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.tagged.clear()
+            self.bytes = 0
+
+    def _remove(self, key):
+        _, size, _, tags = self.entries.pop(key)
+        self.bytes -= size
+        for tag in tags:
+            keys = self.tagged.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.tagged[tag]
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "bytes": self.bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+
+class ResponseCache:
+    def __init__(self, max_entries=2048, max_bytes=16 * 1024 * 1024, ttl_seconds=600,
+                 intent_max_entries=8192):
+        self.intents = LRUCache(intent_max_entries)
+        self.answers = LRUCache(max_entries, max_bytes, ttl_seconds)
+
+    # `context` identifies the chat context a follow-up was answered from
+    def answer_key(self, query, intent, data_version, today=None, context=None):
+        key = (query, intent, data_version)
+        if intent in DATE_DEPENDENT_INTENTS:
+            key += (today,)
+        if context is not None:
+            key += (context,)
+        return key
+
+    # Refresher callback: drop answers that mention a changed team
+    def invalidate_teams(self, team_names, store=None):
+        self.answers.invalidate_tags(team_names)
+
+    def stats(self):
+        return {"intents": self.intents.stats(), "answers": self.answers.stats()}
@@ -0,0 +1,101 @@
+import os
+
+# Runtime configuration, read from COPILOT_* environment variables
+
+
+def env_int(name, default):
+    return int(os.environ.get(name, default))
+
+
+def env_float(name, default):
+    return float(os.environ.get(name, default))
+
+
+def env_str(name, default):
+    return os.environ.get(name, default)
+
+
+# Shared intent inference worker
+INFERENCE_MAX_BATCH_SIZE = env_int("COPILOT_INFERENCE_MAX_BATCH_SIZE", 16)
+INFERENCE_MAX_WAIT_MS = env_float("COPILOT_INFERENCE_MAX_WAIT_MS", 10)
+# 0 lets the worker pick one thread per available CPU core
+TORCH_NUM_THREADS = env_int("COPILOT_TORCH_NUM_THREADS", 0)
+
+# Intent inference server (inference_server.py). With an address (Unix socket
+# path or host:port) the app sends intent queries to the server instead of
+# loading the model; several app processes can share one server.
+INFERENCE_SERVER_ADDRESS = env_str("COPILOT_INFERENCE_SERVER_ADDRESS", "")
+# Server worker processes sharing the model weights (0 = one per CPU core)
+INFERENCE_SERVER_WORKERS = env_int("COPILOT_INFERENCE_SERVER_WORKERS", 2)
+# Shared secret for connections; required for a host:port address
+INFERENCE_SERVER_AUTHKEY = env_str("COPILOT_INFERENCE_SERVER_AUTHKEY", "")
+
+# Intent model: "pipeline" (zero-shot pipeline), "nli" (cross-encoder with
+# pre-tokenized label hypotheses) or "embedding" (bi-encoder label prototypes)
+INTENT_MODEL_MODE = env_str("COPILOT_INTENT_MODEL_MODE", "pipeline")
+NLI_MODEL = env_str("COPILOT_NLI_MODEL", "facebook/bart-large-mnli")
+EMBEDDING_MODEL = env_str("COPILOT_EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+
+# Weights backend: "pytorch" (fp32), "int8" (dynamic quantization) or "onnx"
+# (ONNX Runtime, needs a model exported with intent_model_tools.py)
+INTENT_BACKEND = env_str("COPILOT_INTENT_BACKEND", "pytorch")
+# Set to 1 to load models only from local directories / the local cache
+MODEL_LOCAL_FILES_ONLY = env_str("COPILOT_MODEL_LOCAL_FILES_ONLY", "0") == "1"
+
+# Sprint data: a {"teams": [...]} JSON export or NDJSON (one team per line).
+# With a snapshot path the parsed data is cached there and mapped from disk on
+# later starts while the data file is unchanged.
+DATA_PATH = env_str("COPILOT_DATA_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "Data.json"))
+DATA_SNAPSHOT_PATH = env_str("COPILOT_DATA_SNAPSHOT_PATH", "")
+
+# Hot reload: seconds between checks of the data file and the delta drop
+# directory (0 disables reloading)
+DATA_POLL_SECONDS = env_float("COPILOT_DATA_POLL_SECONDS", 2)
+DATA_DROP_DIR = env_str("COPILOT_DATA_DROP_DIR", "")
+
+# Storage backend: "memory" (parsed into process memory) or "sqlite" (indexed
+# database shared by all app processes, see sqlite_store.py). With
+# DATA_SQLITE_IMPORT the database is re-imported whenever the data file
+# changes; set it to 0 when a separate job runs `python sqlite_store.py`.
+# Delta drops only apply to the memory backend.
+DATA_BACKEND = env_str("COPILOT_DATA_BACKEND", "memory")
+DATA_SQLITE_PATH = env_str("COPILOT_DATA_SQLITE_PATH", os.path.splitext(DATA_PATH)[0] + ".sqlite3")
+DATA_SQLITE_IMPORT = env_str("COPILOT_DATA_SQLITE_IMPORT", "1") == "1"
+DATA_SQLITE_POOL_SIZE = env_int("COPILOT_DATA_SQLITE_POOL_SIZE", 4)
+
+# Response cache (intent results and rendered answers)
+RESPONSE_CACHE_MAX_ENTRIES = env_int("COPILOT_RESPONSE_CACHE_MAX_ENTRIES", 2048)
+RESPONSE_CACHE_MAX_MB = env_float("COPILOT_RESPONSE_CACHE_MAX_MB", 16)
+RESPONSE_CACHE_TTL_SECONDS = env_float("COPILOT_RESPONSE_CACHE_TTL_SECONDS", 600)
+INTENT_CACHE_MAX_ENTRIES = env_int("COPILOT_INTENT_CACHE_MAX_ENTRIES", 8192)
+
+# PDF reports: worker processes (0 = one per CPU) and cached reports kept
+REPORT_WORKERS = env_int("COPILOT_REPORT_WORKERS", 0)
+REPORT_CACHE_SIZE = env_int("COPILOT_REPORT_CACHE_SIZE", 512)
+
+# Charts: "matplotlib" (cached PNG images) or "vega" (Vega-Lite, drawn in the browser)
+CHART_BACKEND = env_str("COPILOT_CHART_BACKEND", "matplotlib")
+CHART_CACHE_SIZE = env_int("COPILOT_CHART_CACHE_SIZE", 256)
+
+# Chat pipeline: background worker threads, unfinished questions allowed per
+# session, seconds before a question times out, and UI polling interval
+CHAT_WORKERS = env_int("COPILOT_CHAT_WORKERS", 4)
+CHAT_MAX_PENDING = env_int("COPILOT_CHAT_MAX_PENDING", 2)
+CHAT_TIMEOUT_SECONDS = env_float("COPILOT_CHAT_TIMEOUT_SECONDS", 30)
+CHAT_POLL_SECONDS = env_float("COPILOT_CHAT_POLL_SECONDS", 0.25)
+
+# Chat history: turns and KB kept per session, and MB for all sessions together
+CHAT_HISTORY_MAX_TURNS = env_int("COPILOT_CHAT_HISTORY_MAX_TURNS", 50)
+CHAT_HISTORY_MAX_KB = env_float("COPILOT_CHAT_HISTORY_MAX_KB", 256)
+CHAT_HISTORY_TOTAL_MB = env_float("COPILOT_CHAT_HISTORY_TOTAL_MB", 64)
+
+# Metrics: off by default. With a port, Prometheus text is served on
+# http://METRICS_HOST:METRICS_PORT/metrics; the admin panel shows them in the sidebar
+METRICS_ENABLED = env_str("COPILOT_METRICS_ENABLED", "0") == "1"
+METRICS_PORT = env_int("COPILOT_METRICS_PORT", 0)
+METRICS_HOST = env_str("COPILOT_METRICS_HOST", "127.0.0.1")
+METRICS_ADMIN_PANEL = env_str("COPILOT_METRICS_ADMIN_PANEL", "0") == "1"
+
+# Import pandas, matplotlib and reportlab in a background thread after the
+# first render (0 loads them on first use only)
+WARMUP_IMPORTS = env_str("COPILOT_WARMUP_IMPORTS", "1") == "1"
@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+
+from sprint_data import DATE_COLUMNS, SPRINT_COLUMNS, SPRINT_TYPECODES, SprintRange, date_to_ordinal
+from sprint_forecast import batch_forecast, teams_forecast_to_miss
+
+# Fleet-wide sprint analytics over one columnar table, vectorized with
+# NumPy/pandas instead of looping team by team.
+#
+# The sprint table has one row per sprint in team order:
+#   team, sprint_id, start_date, end_date, planned, completed, velocity, blockers, bugs
+
+RISK_LABELS = np.array(["🟢 Low Risk", "🟡 Moderate Risk", "🔴 High Risk"], dtype=object)
+HIGH_RISK = RISK_LABELS[2]
+
+COLUMN_NAMES = {
+    "story_points_planned": "planned",
+    "story_points_completed": "completed",
+    "bugs_reported": "bugs",
+}
+
+# date.toordinal() of 1970-01-01, to turn ordinals into datetime64[D]
+EPOCH_ORDINAL = 719163
+
+
+def ordinals_to_dates(ordinals):
+    days = np.asarray(ordinals, dtype="int64") - EPOCH_ORDINAL
+    dates = days.astype("datetime64[D]")
+    dates[np.asarray(ordinals) == 0] = np.datetime64("NaT")
+    return dates
+
+
+# Builds the table without materializing Sprint records: teams backed by a
+# SprintTable are gathered straight from its columns
+def sprint_table(store):
+    names, lengths = [], []
+    columns = {name: [] for name in SPRINT_COLUMNS}
+    for team in store.teams:
+        sprints = team.sprints
+        names.append(team.team_name)
+        lengths.append(len(sprints))
+        if isinstance(sprints, SprintRange):
+            for name in SPRINT_COLUMNS:
+                column = np.frombuffer(sprints.table.columns[name], dtype=SPRINT_TYPECODES[name])
+                columns[name].append(column[sprints.start:sprints.stop])
+        else:
+            for name in SPRINT_COLUMNS:
+                values = [getattr(s, name) for s in sprints]
+                if name in DATE_COLUMNS:
+                    values = [date_to_ordinal(v) for v in values]
+                columns[name].append(np.asarray(values, dtype=SPRINT_TYPECODES[name]))
+    frame = pd.DataFrame({
+        "team": pd.Categorical(np.repeat(np.asarray(names, dtype=object), lengths), categories=names),
+    })
+    for name in SPRINT_COLUMNS:
+        values = np.concatenate(columns[name]) if columns[name] else np.empty(0, dtype=SPRINT_TYPECODES[name])
+        frame[COLUMN_NAMES.get(name, name)] = ordinals_to_dates(values) if name in DATE_COLUMNS else values
+    return frame
+
+
+def latest_sprints(frame):
+    return frame.groupby("team", observed=True, sort=False).tail(1).set_index("team")
+
+
+# Same rules as sprint_data.calculate_risk, for every row at once
+def risk_levels(frame):
+    score = (
+        (frame["blockers"] >= 4).astype(int)
+        + (frame["completed"] < 0.8 * frame["planned"]).astype(int)
+        + (frame["bugs"] > 4).astype(int)
+    )
+    return pd.Series(RISK_LABELS[np.minimum(score, 2)], index=frame.index, name="risk")
+
+
+# Mean of the last `lookback` sprints per team (like get_last_n_velocities)
+def lookback_averages(frame, lookback=3):
+    recent = frame.groupby("team", observed=True, sort=False).tail(lookback)
+    return recent.groupby("team", observed=True, sort=False)[["velocity", "blockers", "bugs"]].mean()
+
+
+# Rolling mean over the previous `window` sprints, per team, for every sprint
+def rolling_velocity(frame, window=3):
+    rolling = frame.groupby("team", observed=True, sort=False)["velocity"].rolling(window, min_periods=1).mean()
+    return rolling.reset_index(level=0, drop=True).sort_index()
+
+
+# Per-team summary of the latest sprint with its risk level; cached per data
+# snapshot by the app. Next-sprint forecasts of every team are computed on
+# first use.
+class FleetAnalytics:
+    def __init__(self, store):
+        self.version = store.version
+        self.sprints = sprint_table(store)
+        self.latest = latest_sprints(self.sprints)
+        self.latest["risk"] = risk_levels(self.latest)
+        self._forecasts = None
+
+    @property
+    def forecasts(self):
+        if self._forecasts is None:
+            self._forecasts = batch_forecast(self.sprints)
+        return self._forecasts
+
+    def teams_with_risk(self, risk=HIGH_RISK):
+        return list(self.latest.index[self.latest["risk"] == risk])
+
+    # Teams whose latest sprint ended in the `days` before `until` (default: now)
+    def teams_with_recent_sprint(self, days=7, until=None):
+        end_dates = self.latest["end_date"]
+        if until is None:
+            recent = end_dates >= pd.Timestamp.today() - pd.Timedelta(days=days)
+        else:
+            until = pd.Timestamp(until)
+            recent = (end_dates >= until - pd.Timedelta(days=days)) & (end_dates <= until)
+        return list(self.latest.index[recent])
+
+    def lookback_averages(self, lookback=3):
+        return lookback_averages(self.sprints, lookback)
+
+    def teams_forecast_to_miss(self):
+        return teams_forecast_to_miss(self.forecasts)
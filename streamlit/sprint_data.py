@@ -0,0 +1,309 @@
+import json
+from array import array
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+
+from entity_extractor import EntityExtractor, name_words
+
+# Compact records for the tracker export (only the fields the chatbot and
+# reports use) plus an indexed store built once from Data.json.
+
+
+@dataclass(slots=True)
+class Member:
+    name: str
+    role: str
+
+
+@dataclass(slots=True)
+class Sprint:
+    sprint_id: int
+    start_date: str
+    end_date: str
+    story_points_planned: int
+    story_points_completed: int
+    velocity: int
+    blockers: int
+    bugs_reported: int
+
+
+# User stories and bugs share one record type (see work_item_type)
+@dataclass(slots=True)
+class WorkItem:
+    id: str
+    title: str
+    assigned_to: str
+    status: str
+    opened_date: str
+    cycle_time_days: int
+    work_item_type: str
+
+
+# `sprints` is a list of Sprint records or a SprintRange over a SprintTable
+@dataclass(slots=True)
+class Team:
+    team_name: str
+    members: list
+    sprints: Sequence
+    user_stories: list
+    bugs: list
+
+
+SPRINT_COLUMNS = (
+    "sprint_id", "start_date", "end_date", "story_points_planned", "story_points_completed",
+    "velocity", "blockers", "bugs_reported",
+)
+DATE_COLUMNS = ("start_date", "end_date")
+# array typecode per column: int64 for sprint IDs and date ordinals, float64
+# for points and counts (exports may hold fractional story points)
+SPRINT_TYPECODES = {name: "q" if name == "sprint_id" or name in DATE_COLUMNS else "d" for name in SPRINT_COLUMNS}
+
+
+def date_to_ordinal(value):
+    return date.fromisoformat(value).toordinal() if value else 0
+
+
+def ordinal_to_date(value):
+    return date.fromordinal(value).isoformat() if value else ""
+
+
+# Whole numbers come back out of a float64 column as ints, like json.load gives them
+def as_number(value):
+    return int(value) if value.is_integer() else value
+
+
+# Array-backed sprint storage: one column per sprint field, typed by
+# SPRINT_TYPECODES (dates as proleptic ordinals, 0 when missing). Columns are
+# arrays while loading and may be memoryviews over an mmap'd snapshot
+# afterwards (see data_ingest).
+class SprintTable:
+    def __init__(self, columns=None):
+        self.columns = columns or {name: array(SPRINT_TYPECODES[name]) for name in SPRINT_COLUMNS}
+
+    def __len__(self):
+        return len(self.columns["sprint_id"])
+
+    def append(self, s):
+        index = len(self)
+        for name in SPRINT_COLUMNS:
+            value = s.get(name, "") if name in DATE_COLUMNS else s[name]
+            self.columns[name].append(date_to_ordinal(value) if name in DATE_COLUMNS else value)
+        return index
+
+    def row(self, i):
+        c = self.columns
+        return Sprint(
+            c["sprint_id"][i], ordinal_to_date(c["start_date"][i]), ordinal_to_date(c["end_date"][i]),
+            as_number(c["story_points_planned"][i]), as_number(c["story_points_completed"][i]),
+            as_number(c["velocity"][i]), as_number(c["blockers"][i]), as_number(c["bugs_reported"][i]),
+        )
+
+
+# A team's contiguous slice of a SprintTable; Sprint records are built on access
+class SprintRange(Sequence):
+    __slots__ = ("table", "start", "stop")
+
+    def __init__(self, table, start, stop):
+        self.table = table
+        self.start = start
+        self.stop = stop
+
+    def __len__(self):
+        return self.stop - self.start
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.table.row(self.start + j) for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("sprint index out of range")
+        return self.table.row(self.start + i)
+
+    # Pickle (e.g. for worker processes) as a plain list, not the whole table
+    def __reduce__(self):
+        return list, (list(self),)
+
+
+def work_item_from_dict(d):
+    return WorkItem(
+        d["id"], d.get("title", ""), d.get("assigned_to", ""), d.get("status", ""),
+        d.get("opened_date", ""), d.get("cycle_time_days", 0), d.get("work_item_type", ""),
+    )
+
+
+# With a SprintTable the team's sprints are appended to it instead of being
+# kept as separate records
+def team_from_dict(d, sprint_table=None):
+    if sprint_table is None:
+        sprints = [
+            Sprint(
+                s["sprint_id"], s.get("start_date", ""), s.get("end_date", ""),
+                s["story_points_planned"], s["story_points_completed"], s["velocity"],
+                s["blockers"], s["bugs_reported"],
+            )
+            for s in d.get("sprints", [])
+        ]
+    else:
+        start = len(sprint_table)
+        for s in d.get("sprints", []):
+            sprint_table.append(s)
+        sprints = SprintRange(sprint_table, start, len(sprint_table))
+    return Team(
+        d["team_name"],
+        [Member(m["name"], m["role"]) for m in d.get("members", [])],
+        sprints,
+        [work_item_from_dict(w) for w in d.get("user_stories", [])],
+        [work_item_from_dict(w) for w in d.get("bugs", [])],
+    )
+
+
+def name_key(text):
+    return " ".join(name_words(text))
+
+
+# Teams plus dict indexes, so lookups cost O(1) instead of scanning every team:
+#   teams_by_name  normalized team name -> Team
+#   stories_by_id  lower-case story ID -> (WorkItem, Team)
+#   bugs_by_id     lower-case bug ID -> (WorkItem, Team)
+#   bug_counts     normalized team name -> (open, closed)
+#   team_versions  normalized team name -> store version that last changed it
+# plus an entity extractor over the same indexes for free-text queries.
+# `version` identifies the data snapshot (bumped by data_refresh on every swap).
+class SprintStore:
+    def __init__(self, teams, version=0):
+        self.version = version
+        self.teams = []
+        self.teams_by_name = {}
+        self.stories_by_id = {}
+        self.bugs_by_id = {}
+        self.bug_counts = {}
+        self.team_versions = {}
+        self.entities = EntityExtractor(self.stories_by_id, self.bugs_by_id)
+        for team in teams:
+            self.teams.append(team)
+            self.index_team(team)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(team_from_dict(t) for t in data["teams"])
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r") as f:
+            return cls.from_dict(json.load(f))
+
+    # Independent copy for copy-on-write updates; records are shared
+    def copy(self, version=None):
+        clone = SprintStore([], self.version if version is None else version)
+        clone.teams = list(self.teams)
+        clone.teams_by_name = dict(self.teams_by_name)
+        clone.stories_by_id = dict(self.stories_by_id)
+        clone.bugs_by_id = dict(self.bugs_by_id)
+        clone.bug_counts = dict(self.bug_counts)
+        clone.team_versions = dict(self.team_versions)
+        clone.entities = self.entities.copy(clone.stories_by_id, clone.bugs_by_id)
+        return clone
+
+    def index_team(self, team):
+        key = name_key(team.team_name)
+        self.teams_by_name[key] = team
+        self.team_versions[key] = self.version
+        self.entities.add_team(team)
+        for story in team.user_stories:
+            self.stories_by_id[story.id.lower()] = (story, team)
+        open_bugs = closed_bugs = 0
+        for bug in team.bugs:
+            self.bugs_by_id[bug.id.lower()] = (bug, team)
+            status = bug.status.lower()
+            open_bugs += status == "open"
+            closed_bugs += status == "closed"
+        self.bug_counts[key] = (open_bugs, closed_bugs)
+
+    def unindex_team(self, team):
+        key = name_key(team.team_name)
+        if self.teams_by_name.get(key) is team:
+            del self.teams_by_name[key]
+            self.bug_counts.pop(key, None)
+            self.team_versions.pop(key, None)
+        self.entities.remove_team(team)
+        for items, index in ((team.user_stories, self.stories_by_id), (team.bugs, self.bugs_by_id)):
+            for item in items:
+                if index.get(item.id.lower(), (None, None))[1] is team:
+                    del index[item.id.lower()]
+
+    # Adds a team or replaces the one with the same name, touching only that
+    # team's index entries
+    def upsert_team(self, team):
+        old = self.get_team(team.team_name)
+        if old is None:
+            self.teams.append(team)
+        else:
+            self.unindex_team(old)
+            self.teams[self.teams.index(old)] = team
+        self.index_team(team)
+
+    def remove_team(self, name):
+        old = self.get_team(name)
+        if old is not None:
+            self.unindex_team(old)
+            self.teams.remove(old)
+
+    def team_names(self):
+        return [team.team_name for team in self.teams]
+
+    def get_team(self, name):
+        return self.teams_by_name.get(name_key(name))
+
+    def find_story(self, story_id):
+        return self.stories_by_id.get(story_id.lower())
+
+    def get_bug_counts(self, team):
+        return self.bug_counts.get(name_key(team.team_name), (0, 0))
+
+    # Version of the data an answer about `teams` depends on: per team, so a
+    # refresh only changes it for the teams that were updated
+    def data_version(self, teams=()):
+        if not teams:
+            return self.version
+        return tuple(self.team_versions.get(name_key(t.team_name), self.version) for t in teams)
+
+    def extract_entities(self, text):
+        return self.entities.extract(text)
+
+
+# Utility functions
+def get_latest_sprint(team):
+    return team.sprints[-1]
+
+
+def get_last_n_velocities(team, n=3):
+    return [s.velocity for s in team.sprints[-n:]]
+
+
+def calculate_risk(team):
+    latest = get_latest_sprint(team)
+    risk_score = 0
+    if latest.blockers >= 4:
+        risk_score += 1
+    if latest.story_points_completed < 0.8 * latest.story_points_planned:
+        risk_score += 1
+    if latest.bugs_reported > 4:
+        risk_score += 1
+    return "🔴 High Risk" if risk_score >= 2 else "🟡 Moderate Risk" if risk_score == 1 else "🟢 Low Risk"
+
+
+# Teams whose latest sprint ended in the `days` before `until` (default: now)
+def get_teams_with_recent_sprint(teams, days=7, until=None):
+    recent_teams = []
+    today = until or datetime.today()
+    cutoff = today - timedelta(days=days)
+    for team in teams:
+        last_sprint = get_latest_sprint(team)
+        end_date = last_sprint.end_date
+        if end_date:
+            sprint_date = datetime.strptime(end_date, "%Y-%m-%d")
+            if sprint_date >= cutoff and (until is None or sprint_date <= until):
+                recent_teams.append(team)
+    return recent_teams
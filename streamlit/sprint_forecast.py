@@ -0,0 +1,177 @@
+import math
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# Deterministic sprint forecasting.
+#
+# Three models per team, all fit incrementally (O(1) per new sprint):
+#   EWMA          exponentially weighted averages of velocity, blockers, bugs
+#                 and planned points
+#   linear trend  least-squares line through velocity by sprint number
+#   Monte Carlo   completion ratio (completed / planned) drawn from a normal
+#                 fit, times the expected planned points, for a prediction
+#                 interval
+# The Monte Carlo step uses one fixed, seeded set of standard normal draws for
+# every team (common random numbers), so the same data always gives the same
+# forecast and single-team and batch forecasts agree.
+
+DEFAULT_ALPHA = 0.5  # same weight as a 3-sprint lookback (2 / (3 + 1))
+MONTE_CARLO_SEED = 20240401
+MONTE_CARLO_DRAWS = 2000
+INTERVAL = (0.1, 0.9)  # 80% prediction interval
+
+STANDARD_NORMAL_DRAWS = np.random.default_rng(MONTE_CARLO_SEED).standard_normal(MONTE_CARLO_DRAWS)
+
+
+@dataclass(slots=True)
+class ForecastState:
+    n: int = 0
+    velocity: float = 0.0
+    blockers: float = 0.0
+    bugs: float = 0.0
+    planned: float = 0.0
+    sum_x: float = 0.0
+    sum_y: float = 0.0
+    sum_xy: float = 0.0
+    sum_xx: float = 0.0
+    ratio_mean: float = 0.0
+    ratio_m2: float = 0.0
+
+    def update(self, sprint, alpha=DEFAULT_ALPHA):
+        values = (sprint.velocity, sprint.blockers, sprint.bugs_reported, sprint.story_points_planned)
+        if self.n == 0:
+            self.velocity, self.blockers, self.bugs, self.planned = values
+        else:
+            self.velocity += alpha * (values[0] - self.velocity)
+            self.blockers += alpha * (values[1] - self.blockers)
+            self.bugs += alpha * (values[2] - self.bugs)
+            self.planned += alpha * (values[3] - self.planned)
+        x, y = self.n, sprint.velocity
+        self.sum_x += x
+        self.sum_y += y
+        self.sum_xy += x * y
+        self.sum_xx += x * x
+        # Welford's running mean / variance of the completion ratio
+        ratio = completion_ratio(sprint.story_points_completed, sprint.story_points_planned)
+        self.n += 1
+        delta = ratio - self.ratio_mean
+        self.ratio_mean += delta / self.n
+        self.ratio_m2 += delta * (ratio - self.ratio_mean)
+
+
+@dataclass(slots=True, frozen=True)
+class Forecast:
+    velocity: int
+    velocity_low: int
+    velocity_high: int
+    trend_velocity: int
+    blockers: float
+    bugs: float
+
+
+def completion_ratio(completed, planned):
+    return completed / planned if planned else 1.0
+
+
+def trend_at(n, sum_x, sum_y, sum_xy, sum_xx):
+    denominator = n * sum_xx - sum_x * sum_x
+    slope = (n * sum_xy - sum_x * sum_y) / denominator if denominator else 0.0
+    intercept = (sum_y - slope * sum_x) / n
+    return intercept + slope * n
+
+
+def velocity_interval(planned, ratio_mean, ratio_std):
+    draws = planned * np.maximum(ratio_mean + ratio_std * STANDARD_NORMAL_DRAWS, 0.0)
+    return np.quantile(draws, INTERVAL)
+
+
+def forecast_from_state(state):
+    ratio_std = math.sqrt(state.ratio_m2 / (state.n - 1)) if state.n > 1 else 0.0
+    low, high = velocity_interval(state.planned, state.ratio_mean, ratio_std)
+    trend = trend_at(state.n, state.sum_x, state.sum_y, state.sum_xy, state.sum_xx)
+    return Forecast(
+        velocity=round(state.velocity),
+        velocity_low=round(low),
+        velocity_high=round(high),
+        trend_velocity=max(0, round(trend)),
+        blockers=round(state.blockers, 1),
+        bugs=round(state.bugs, 1),
+    )
+
+
+# Keeps one ForecastState per (team, data version) and only feeds it sprints
+# it has not seen. `version` is the store's data_version for the team, so a
+# request still holding an older snapshot never reuses or replaces the state
+# fit to newer data. Teams changed by a data refresh are dropped and refit on
+# next use.
+class SprintForecaster:
+    def __init__(self, alpha=DEFAULT_ALPHA):
+        self.alpha = alpha
+        self.states = {}
+        self.lock = threading.Lock()
+
+    def forecast(self, team, version=None):
+        key = (team.team_name, version)
+        with self.lock:
+            state = self.states.get(key)
+            if state is None or state.n > len(team.sprints):
+                state = ForecastState()
+            for sprint in team.sprints[state.n:]:
+                state.update(sprint, self.alpha)
+            self.states[key] = state
+            return forecast_from_state(state)
+
+    # Refresher callback
+    def invalidate_teams(self, team_names, store=None):
+        team_names = set(team_names)
+        with self.lock:
+            for key in [key for key in self.states if key[0] in team_names]:
+                del self.states[key]
+
+
+# All teams in one vectorized pass over a sprint_analytics.sprint_table frame;
+# returns one row per team with the same numbers as SprintForecaster, plus the
+# expected planned points
+def batch_forecast(frame, alpha=DEFAULT_ALPHA):
+    groups = frame.groupby("team", observed=True, sort=False)
+    ewma = groups[["velocity", "blockers", "bugs", "planned"]].ewm(alpha=alpha, adjust=False).mean()
+    ewma = ewma.groupby(level=0, observed=True, sort=False).tail(1).reset_index(level=1, drop=True)
+
+    x = groups.cumcount().astype(float)
+    y = frame["velocity"].astype(float)
+    sums = pd.DataFrame({"team": frame["team"], "x": x, "y": y, "xy": x * y, "xx": x * x})
+    sums = sums.groupby("team", observed=True, sort=False).agg(
+        n=("x", "size"), sum_x=("x", "sum"), sum_y=("y", "sum"), sum_xy=("xy", "sum"), sum_xx=("xx", "sum"))
+    denominator = sums["n"] * sums["sum_xx"] - sums["sum_x"] ** 2
+    slope = ((sums["n"] * sums["sum_xy"] - sums["sum_x"] * sums["sum_y"]) / denominator.where(denominator != 0))
+    slope = slope.fillna(0.0)
+    trend = (sums["sum_y"] - slope * sums["sum_x"]) / sums["n"] + slope * sums["n"]
+
+    planned = frame["planned"].to_numpy()
+    ratio = np.divide(frame["completed"].to_numpy(), planned, out=np.ones(len(frame)), where=planned != 0)
+    ratios = pd.Series(ratio, index=frame.index).groupby(frame["team"], observed=True, sort=False)
+    ratio_mean = ratios.mean()
+    ratio_std = ratios.std(ddof=1).fillna(0.0)
+
+    draws = ewma["planned"].to_numpy()[:, None] * np.maximum(
+        ratio_mean.to_numpy()[:, None] + ratio_std.to_numpy()[:, None] * STANDARD_NORMAL_DRAWS[None, :], 0.0)
+    low, high = np.quantile(draws, INTERVAL, axis=1)
+
+    return pd.DataFrame({
+        "velocity": ewma["velocity"].round().astype(int),
+        "velocity_low": np.round(low).astype(int),
+        "velocity_high": np.round(high).astype(int),
+        "trend_velocity": trend.round().clip(lower=0).astype(int),
+        "blockers": ewma["blockers"].round(1),
+        "bugs": ewma["bugs"].round(1),
+        "planned": ewma["planned"].round(1),
+    }, index=ewma.index)
+
+
+# Teams whose forecast velocity is under 80% of the points they are expected to
+# plan (the completion threshold of calculate_risk)
+def teams_forecast_to_miss(forecasts):
+    return list(forecasts.index[forecasts["velocity"] < 0.8 * forecasts["planned"]])
@@ -0,0 +1,477 @@
+import argparse
+import hashlib
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+from contextlib import contextmanager
+from dataclasses import replace
+from datetime import datetime, time, timedelta
+
+from data_ingest import iter_team_dicts, source_signature
+from entity_extractor import TEAM, EntityExtractor
+from response_cache import LRUCache, MISSING
+from sprint_data import Member, Sprint, Team, WorkItem, name_key
+
+# SQLite storage backend for sprint data.
+#
+# import_data() loads a tracker export (JSON or NDJSON, streamed one team at a
+# time) into an indexed database. It builds a new file next to the old one
+# and swaps it in with os.replace, so readers never see a half-written
+# import. Several app processes can share one database file, each reading
+# through its own pool of read-only connections.
+#
+# SqliteSprintStore has the same interface as sprint_data.SprintStore.
+# Teams are read and built into the usual Team records on demand (with a
+# small LRU cache), so get_latest_sprint, calculate_risk and the other
+# helpers work unchanged. Fleet-wide questions (recent sprints, risk levels,
+# bug counts) are answered by indexed SQL aggregates instead of walking every
+# team.
+#
+#   python sqlite_store.py --data Data.json --db sprints.db
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE teams (
+    team_id INTEGER PRIMARY KEY,
+    team_name TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    fingerprint TEXT NOT NULL
+);
+CREATE TABLE members (
+    team_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    role TEXT NOT NULL,
+    PRIMARY KEY (team_id, position)
+) WITHOUT ROWID;
+CREATE TABLE sprints (
+    team_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    latest INTEGER NOT NULL,
+    sprint_id INTEGER NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    story_points_planned INTEGER NOT NULL,
+    story_points_completed INTEGER NOT NULL,
+    velocity INTEGER NOT NULL,
+    blockers INTEGER NOT NULL,
+    bugs_reported INTEGER NOT NULL,
+    PRIMARY KEY (team_id, position)
+) WITHOUT ROWID;
+CREATE TABLE work_items (
+    kind TEXT NOT NULL,
+    id_key TEXT NOT NULL,
+    team_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    assigned_to TEXT NOT NULL,
+    status TEXT NOT NULL,
+    status_key TEXT NOT NULL,
+    opened_date TEXT NOT NULL,
+    cycle_time_days INTEGER NOT NULL,
+    work_item_type TEXT NOT NULL,
+    PRIMARY KEY (kind, id_key)
+);
+CREATE INDEX teams_name ON teams (name_key);
+CREATE INDEX work_items_team ON work_items (team_id, kind, position);
+CREATE INDEX bug_status ON work_items (team_id, status_key) WHERE kind = 'bug';
+CREATE INDEX latest_sprint_end ON sprints (end_date) WHERE latest = 1;
+"""
+
+STORY = "story"
+BUG = "bug"
+
+# calculate_risk's score (0-3) on a sprints row, and the label per condition
+RISK_SCORE_SQL = (
+    "((s.blockers >= 4) + (s.story_points_completed < 0.8 * s.story_points_planned)"
+    " + (s.bugs_reported > 4))"
+)
+RISK_CONDITIONS = {
+    "🔴 High Risk": ">= 2",
+    "🟡 Moderate Risk": "= 1",
+    "🟢 Low Risk": "= 0",
+}
+
+
+def team_fingerprint(d):
+    return hashlib.sha256(json.dumps(d, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def read_meta(conn):
+    return dict(conn.execute("SELECT key, value FROM meta"))
+
+
+def previous_teams(db_path):
+    if not os.path.exists(db_path):
+        return 0, {}
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        version = int(read_meta(conn).get("version", 0))
+        teams = {key: (fingerprint, v) for key, fingerprint, v in
+                 conn.execute("SELECT name_key, fingerprint, version FROM teams")}
+        return version, teams
+    except sqlite3.DatabaseError:
+        return 0, {}
+    finally:
+        conn.close()
+
+
+def work_item_row(kind, d, team_id, position):
+    return (
+        kind, d["id"].lower(), team_id, position, d["id"], d.get("title", ""), d.get("assigned_to", ""),
+        d.get("status", ""), d.get("status", "").lower(), d.get("opened_date", ""),
+        d.get("cycle_time_days", 0), d.get("work_item_type", ""),
+    )
+
+
+# Imports `data_path` into `db_path`; teams whose data did not change keep the
+# version they had in the previous database. Returns the new version.
+def import_data(data_path, db_path):
+    old_version, old_teams = previous_teams(db_path)
+    version = old_version + 1
+    tmp_path = f"{db_path}.{os.getpid()}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript("PRAGMA journal_mode = OFF; PRAGMA synchronous = OFF;")
+        conn.executescript(SCHEMA)
+        for team_id, d in enumerate(iter_team_dicts(data_path)):
+            key = name_key(d["team_name"])
+            fingerprint = team_fingerprint(d)
+            previous = old_teams.get(key)
+            team_version = previous[1] if previous and previous[0] == fingerprint else version
+            conn.execute("INSERT INTO teams VALUES (?, ?, ?, ?, ?)",
+                         (team_id, d["team_name"], key, team_version, fingerprint))
+            conn.executemany("INSERT INTO members VALUES (?, ?, ?, ?)", [
+                (team_id, i, m["name"], m["role"]) for i, m in enumerate(d.get("members", []))])
+            sprints = d.get("sprints", [])
+            conn.executemany("INSERT INTO sprints VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", [
+                (team_id, i, int(i == len(sprints) - 1), s["sprint_id"], s.get("start_date", ""),
+                 s.get("end_date", ""), s["story_points_planned"], s["story_points_completed"],
+                 s["velocity"], s["blockers"], s["bugs_reported"])
+                for i, s in enumerate(sprints)])
+            conn.executemany("INSERT OR REPLACE INTO work_items VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", [
+                work_item_row(STORY, w, team_id, i) for i, w in enumerate(d.get("user_stories", []))])
+            conn.executemany("INSERT OR REPLACE INTO work_items VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", [
+                work_item_row(BUG, w, team_id, i) for i, w in enumerate(d.get("bugs", []))])
+        size, mtime_ns = source_signature(data_path)
+        conn.executemany("INSERT INTO meta VALUES (?, ?)", [
+            ("version", str(version)), ("source_size", str(size)), ("source_mtime_ns", str(mtime_ns))])
+        conn.commit()
+        conn.execute("ANALYZE")
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp_path, db_path)
+    return version
+
+
+# True when `db_path` is missing or was imported from a different version of
+# `data_path`
+def needs_import(data_path, db_path):
+    if not os.path.exists(db_path):
+        return True
+    try:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            meta = read_meta(conn)
+        finally:
+            conn.close()
+        return (int(meta["source_size"]), int(meta["source_mtime_ns"])) != source_signature(data_path)
+    except (sqlite3.DatabaseError, KeyError, ValueError):
+        return True
+
+
+# Read-only connections, opened on demand and reused across threads. After
+# close(), connections still borrowed are closed when they are returned.
+class ConnectionPool:
+    def __init__(self, db_path, size=4):
+        self.db_path = db_path
+        self.idle = queue.LifoQueue()
+        self.slots = threading.BoundedSemaphore(size)
+        self.closed = False
+
+    def open(self):
+        conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True, check_same_thread=False)
+        conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    @contextmanager
+    def connection(self):
+        with self.slots:
+            if self.closed:
+                raise RuntimeError(f"connection pool for {self.db_path} is closed")
+            try:
+                conn = self.idle.get_nowait()
+            except queue.Empty:
+                conn = self.open()
+            try:
+                yield conn
+            finally:
+                self.idle.put(conn)
+                if self.closed:
+                    self.close()
+
+    def close(self):
+        self.closed = True
+        while True:
+            try:
+                self.idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+# Team records by position, built on access (like SprintRange for sprints)
+class TeamList:
+    def __init__(self, store):
+        self.store = store
+
+    def __len__(self):
+        return len(self.store.team_rows)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        return self.store.team_by_id(self.store.team_rows[i][0])
+
+    def __iter__(self):
+        for team_id, _, _ in self.store.team_rows:
+            yield self.store.team_by_id(team_id)
+
+
+# Stands in for SprintStore.stories_by_id / bugs_by_id in the entity extractor
+class WorkItemIndex:
+    def __init__(self, store, kind):
+        self.store = store
+        self.kind = kind
+
+    def get(self, id_key, default=None):
+        match = self.store.find_work_item(self.kind, id_key)
+        return default if match is None else match
+
+
+# Placeholder stored in the extractor's team-name trie; swapped for the Team
+# record after extraction
+class TeamRef:
+    __slots__ = ("team_name",)
+
+    def __init__(self, team_name):
+        self.team_name = team_name
+
+
+class SqliteSprintStore:
+    def __init__(self, db_path, pool_size=4, cache_size=256):
+        self.db_path = db_path
+        self.pool = ConnectionPool(db_path, pool_size)
+        self.cache = LRUCache(cache_size)
+        with self.pool.connection() as conn:
+            self.version = int(read_meta(conn).get("version", 0))
+            # (team_id, team_name, version) in import order; one small row per team
+            self.team_rows = conn.execute(
+                "SELECT team_id, team_name, version FROM teams ORDER BY team_id").fetchall()
+        self.teams_by_name = {name_key(name): (team_id, name, v) for team_id, name, v in self.team_rows}
+        self.teams = TeamList(self)
+        self.stories_by_id = WorkItemIndex(self, STORY)
+        self.bugs_by_id = WorkItemIndex(self, BUG)
+        self.entities = EntityExtractor(self.stories_by_id, self.bugs_by_id)
+        for _, name, _ in self.team_rows:
+            self.entities.add_team(TeamRef(name))
+
+    def query(self, sql, params=()):
+        with self.pool.connection() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def team_by_id(self, team_id):
+        team = self.cache.get(team_id)
+        if team is MISSING:
+            team = self.read_team(team_id)
+            self.cache.put(team_id, team)
+        return team
+
+    def read_team(self, team_id):
+        with self.pool.connection() as conn:
+            (team_name,), = conn.execute("SELECT team_name FROM teams WHERE team_id = ?", (team_id,))
+            members = [Member(*row) for row in conn.execute(
+                "SELECT name, role FROM members WHERE team_id = ? ORDER BY position", (team_id,))]
+            sprints = [Sprint(*row) for row in conn.execute(
+                "SELECT sprint_id, start_date, end_date, story_points_planned, story_points_completed,"
+                " velocity, blockers, bugs_reported FROM sprints WHERE team_id = ? ORDER BY position",
+                (team_id,))]
+            items = {STORY: [], BUG: []}
+            for kind, *row in conn.execute(
+                    "SELECT kind, id, title, assigned_to, status, opened_date, cycle_time_days, work_item_type"
+                    " FROM work_items WHERE team_id = ? ORDER BY kind, position", (team_id,)):
+                items[kind].append(WorkItem(*row))
+        return Team(team_name, members, sprints, items[STORY], items[BUG])
+
+    def team_names(self):
+        return [name for _, name, _ in self.team_rows]
+
+    def get_team(self, name):
+        row = self.teams_by_name.get(name_key(name))
+        return None if row is None else self.team_by_id(row[0])
+
+    # (WorkItem, Team) for a lower-case ID, through the primary key index
+    def find_work_item(self, kind, id_key):
+        rows = self.query(
+            "SELECT team_id, id, title, assigned_to, status, opened_date, cycle_time_days, work_item_type"
+            " FROM work_items WHERE kind = ? AND id_key = ?", (kind, id_key))
+        if not rows:
+            return None
+        team_id, *item = rows[0]
+        return WorkItem(*item), self.team_by_id(team_id)
+
+    def find_story(self, story_id):
+        return self.find_work_item(STORY, story_id.lower())
+
+    def get_bug_counts(self, team):
+        row = self.teams_by_name.get(name_key(team.team_name))
+        if row is None:
+            return 0, 0
+        (open_bugs, closed_bugs), = self.query(
+            "SELECT COALESCE(SUM(status_key = 'open'), 0), COALESCE(SUM(status_key = 'closed'), 0)"
+            " FROM work_items INDEXED BY bug_status WHERE kind = 'bug' AND team_id = ?", (row[0],))
+        return open_bugs, closed_bugs
+
+    # Open / closed bug counts of every team in one grouped query
+    def all_bug_counts(self):
+        return {name: (open_bugs, closed_bugs) for name, open_bugs, closed_bugs in self.query(
+            "SELECT t.team_name, SUM(w.status_key = 'open'), SUM(w.status_key = 'closed')"
+            " FROM work_items w INDEXED BY bug_status JOIN teams t USING (team_id) WHERE w.kind = 'bug'"
+            " GROUP BY w.team_id ORDER BY w.team_id")}
+
+    def data_version(self, teams=()):
+        if not teams:
+            return self.version
+        return tuple(self.teams_by_name.get(name_key(t.team_name), (0, "", self.version))[2] for t in teams)
+
+    def extract_entities(self, text):
+        entities = self.entities.extract(text)
+        entities.teams = [
+            replace(e, record=team, team=team) for e in entities.teams
+            if e.kind == TEAM and (team := self.get_team(e.record.team_name)) is not None
+        ]
+        return entities
+
+    # Names of teams whose latest sprint ended in the `days` before `until`
+    # (default: now), same window as sprint_data.get_teams_with_recent_sprint
+    def teams_with_recent_sprint(self, days=7, until=None):
+        cutoff = (until or datetime.today()) - timedelta(days=days)
+        first_day = cutoff.date() if cutoff.time() == time() else cutoff.date() + timedelta(days=1)
+        sql = ("SELECT t.team_name FROM sprints s JOIN teams t USING (team_id)"
+               " WHERE s.latest = 1 AND s.end_date >= ?")
+        params = [first_day.isoformat()]
+        if until is not None:
+            sql += " AND s.end_date <= ?"
+            params.append(until.date().isoformat())
+        return [name for name, in self.query(sql + " ORDER BY s.team_id", params)]
+
+    # Names of teams whose latest sprint has calculate_risk level `risk`
+    def teams_with_risk(self, risk="🔴 High Risk"):
+        return [name for name, in self.query(
+            f"SELECT t.team_name FROM sprints s JOIN teams t USING (team_id)"
+            f" WHERE s.latest = 1 AND {RISK_SCORE_SQL} {RISK_CONDITIONS[risk]} ORDER BY s.team_id")]
+
+    # Names of teams whose next-sprint forecast misses their plan, fit on the
+    # sprints of every team read in one query
+    def teams_forecast_to_miss(self):
+        import pandas as pd
+        from sprint_forecast import batch_forecast, teams_forecast_to_miss
+
+        frame = pd.DataFrame(self.query(
+            "SELECT t.team_name, s.story_points_planned, s.story_points_completed, s.velocity, s.blockers,"
+            " s.bugs_reported FROM sprints s JOIN teams t USING (team_id) ORDER BY s.team_id, s.position"),
+            columns=["team", "planned", "completed", "velocity", "blockers", "bugs"])
+        frame["team"] = pd.Categorical(frame["team"], categories=self.team_names())
+        return teams_forecast_to_miss(batch_forecast(frame))
+
+    def close(self):
+        self.pool.close()
+
+
+def changed_team_names(old, new):
+    old_rows = {name: v for _, name, v in old.team_rows}
+    new_rows = {name: v for _, name, v in new.team_rows}
+    return {name for name in old_rows.keys() | new_rows.keys() if old_rows.get(name) != new_rows.get(name)}
+
+
+# Same interface as data_refresh.DataRefresher. Polls the database file and
+# swaps in a new SqliteSprintStore when another process (or this one, with
+# `source_path`) has imported new data. The replaced store stays open until
+# the next swap, for requests that read `refresher.store` before this one, and
+# is then closed so its connections no longer pin the replaced database file.
+class SqliteRefresher:
+    def __init__(self, db_path, source_path=None, poll_interval=2.0, pool_size=4):
+        self.db_path = db_path
+        self.source_path = source_path
+        self.poll_interval = poll_interval
+        self.pool_size = pool_size
+        if source_path and needs_import(source_path, db_path):
+            import_data(source_path, db_path)
+        self.signature = source_signature(db_path)
+        self.store = SqliteSprintStore(db_path, pool_size)
+        self.previous = None
+        self.listeners = []
+        self.last_error = None
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread = None
+        if poll_interval > 0:
+            self.thread = threading.Thread(target=self._run, name="sqlite-refresh", daemon=True)
+            self.thread.start()
+
+    # callback(changed_team_names, store) runs on the refresh thread after a swap
+    def subscribe(self, callback):
+        self.listeners.append(callback)
+
+    def stop(self):
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+
+    def _run(self):
+        while not self.stopped.wait(self.poll_interval):
+            try:
+                self.refresh()
+                self.last_error = None
+            except Exception as e:
+                # Keep serving the last good database
+                self.last_error = e
+
+    def refresh(self):
+        with self.lock:
+            if self.source_path and needs_import(self.source_path, self.db_path):
+                import_data(self.source_path, self.db_path)
+            signature = source_signature(self.db_path)
+            if signature == self.signature:
+                return set()
+            current, new_store = self.store, SqliteSprintStore(self.db_path, self.pool_size)
+            changed = changed_team_names(current, new_store)
+            self.signature = signature
+            self.store = new_store
+            if self.previous is not None:
+                self.previous.close()
+            self.previous = current
+        for callback in self.listeners:
+            callback(changed, new_store)
+        return changed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import sprint data into a SQLite database")
+    parser.add_argument("--data", required=True, help="tracker export (JSON or NDJSON)")
+    parser.add_argument("--db", required=True, help="database file to create or replace")
+    args = parser.parse_args(argv)
+    version = import_data(args.data, args.db)
+    print(json.dumps({"db": args.db, "version": version}))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+import importlib
+import json
+import subprocess
+import sys
+import threading
+import time
+
+# Cold-start profiling and background warm-up of heavy modules.
+#
+# The app imports only what the first render needs; torch / transformers load
+# with the model, and pandas, matplotlib and reportlab on first use or from
+# warm_up_modules() in a background thread once the UI is up. PROFILE keeps
+# the first timing of each startup stage in this process for the sidebar.
+#
+#   python startup.py          # import time of each heavy module, fresh interpreters
+
+# Imported in the background after the first render, in this order
+WARMUP_MODULES = ["numpy", "pandas", "matplotlib.figure", "reportlab.pdfgen.canvas"]
+# Reported by the command line profile
+PROFILE_MODULES = ["streamlit", "torch", "transformers"] + WARMUP_MODULES + [
+    "sprint_analytics", "sprint_forecast", "charts", "reports"]
+
+
+class StartupProfile:
+    def __init__(self):
+        self.timings = {}
+        self.lock = threading.Lock()
+
+    # Keeps the first timing per stage, so reruns do not overwrite cold-start numbers
+    def record(self, stage, seconds):
+        with self.lock:
+            self.timings.setdefault(stage, round(seconds, 4))
+
+    def stage(self, name):
+        return StageTimer(self, name)
+
+    def as_dict(self):
+        with self.lock:
+            return dict(self.timings)
+
+
+class StageTimer:
+    def __init__(self, profile, name):
+        self.profile = profile
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profile.record(self.name, time.perf_counter() - self.started)
+
+
+PROFILE = StartupProfile()
+
+
+# Imports `modules` one by one, timing each; failures are recorded, not raised
+def warm_up_modules(modules=WARMUP_MODULES, profile=PROFILE):
+    for name in modules:
+        started = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            profile.record(f"import {name} (failed)", time.perf_counter() - started)
+            continue
+        profile.record(f"import {name}", time.perf_counter() - started)
+
+
+# Seconds to import `name` in a fresh interpreter, None if it is not installed
+def import_seconds(name):
+    code = f"import time; t = time.perf_counter(); import {name}; print(time.perf_counter() - t)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    return round(float(result.stdout), 4) if result.returncode == 0 else None
+
+
+def main(argv=None):
+    modules = (argv if argv is not None else sys.argv[1:]) or PROFILE_MODULES
+    print(json.dumps({name: import_seconds(name) for name in modules}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
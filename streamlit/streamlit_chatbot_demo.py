@@ -1,229 +1,368 @@
+import time
+script_started = time.perf_counter()
 import streamlit as st
-import json
-import random
-import matplotlib.pyplot as plt
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
-import tempfile
-import os
-from datetime import datetime, timedelta
-from transformers import pipeline
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from intent_router import route_intent
+from inference_engine import BatchingClassifier, configure_torch_threads, use_local_model_cache
+from metrics import (
+    CACHE_LOOKUPS, INTENT_CONFIDENCE, INTENTS, LOW_CONFIDENCE, QUESTIONS, REGISTRY, STAGE_SECONDS,
+    start_http_server,
+)
+from chat_pipeline import CANCELLED, FAILED, TIMED_OUT, ChatPipeline, QueueFull
+from chat_session import ChatTurn, HistoryBudget, is_follow_up, names_entity
+from charts import BLOCKERS_BUGS, COMPLETION_RATIO, VELOCITY, ChartRenderer
+from data_refresh import DataRefresher
+from reports import ReportEngine, report_file_name
+from response_cache import MISSING, UNCACHED_INTENTS, ResponseCache, normalize_query
+from sprint_data import calculate_risk, get_latest_sprint
+from startup import PROFILE, WARMUP_MODULES, warm_up_modules
+import settings
 
- 
-# Load Hugging Face zero-shot classifier
-try:
-    classifier = pipeline("zero-shot-classification", model="facebook/bart-large-mnli", device=-1)
-except Exception as e:
-    st.error("⚠️ Failed to load NLP model. Please check internet connection or environment configuration.")
-    st.stop()
+logger = logging.getLogger(__name__)
+
+# Only light modules above: torch / transformers load with the model in the
+# background, pandas, matplotlib and reportlab on first use or by the import
+# warm-up started after the first render
+PROFILE.record("app imports", time.perf_counter() - script_started)
+
+st.set_page_config(page_title="DevOps Copilot", layout="centered")
+st.title("🤖 DevOps Assistant – Sprint Intelligence Demo")
 
  
-# Load project data
-base_path = os.path.dirname(os.path.abspath(__file__))
-file_path = os.path.join(base_path, "Data.json")
- 
-with open(file_path, "r") as f:
-    data = json.load(f)
- 
-teams = data["teams"]
+# Load the intent classifier (zero-shot pipeline by default) behind the shared
+# batching worker, or connect to the inference server when one is configured
+def load_classifier():
+    if settings.INFERENCE_SERVER_ADDRESS:
+        from inference_server import RemoteClassifier
+
+        return RemoteClassifier(
+            settings.INFERENCE_SERVER_ADDRESS,
+            authkey=settings.INFERENCE_SERVER_AUTHKEY,
+            max_connections=settings.CHAT_WORKERS,
+            timeout=settings.CHAT_TIMEOUT_SECONDS,
+        )
+    if settings.MODEL_LOCAL_FILES_ONLY:
+        use_local_model_cache()
+    with PROFILE.stage("model imports"):
+        from intent_models import load_intent_classifier
+
+        configure_torch_threads(settings.TORCH_NUM_THREADS)
+    with PROFILE.stage("model load"):
+        classifier = load_intent_classifier(
+            settings.INTENT_MODEL_MODE,
+            backend=settings.INTENT_BACKEND,
+            nli_model=settings.NLI_MODEL,
+            embedding_model=settings.EMBEDDING_MODEL,
+            local_files_only=settings.MODEL_LOCAL_FILES_ONLY,
+        )
+    # One throwaway pass so lazy initialisation is not paid by the first real question
+    with PROFILE.stage("model warm-up"):
+        classifier("warm-up", ["sprint status"])
+    return BatchingClassifier(
+        classifier,
+        max_batch_size=settings.INFERENCE_MAX_BATCH_SIZE,
+        max_wait_ms=settings.INFERENCE_MAX_WAIT_MS,
+    )
+
+# Started once per server process and shared by every session and rerun.
+# The model loads in the background so the UI can render while it warms up.
+@st.cache_resource(show_spinner=False)
+def start_model_warmup():
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="model-warmup").submit(load_classifier)
+
+model_future = start_model_warmup()
+
+# Called from chat worker threads, so no Streamlit elements here; a failed
+# load surfaces as the chat job's error
+def get_classifier():
+    return model_future.result()
+
  
-# Utility functions
+# Load project data once per process; the refresher swaps in new snapshots when
+# the data file or drop directory changes
+@st.cache_resource(show_spinner=False)
+def load_data():
+    with PROFILE.stage("data load"):
+        if settings.DATA_BACKEND == "sqlite":
+            from sqlite_store import SqliteRefresher
+
+            return SqliteRefresher(
+                settings.DATA_SQLITE_PATH,
+                source_path=settings.DATA_PATH if settings.DATA_SQLITE_IMPORT else None,
+                poll_interval=settings.DATA_POLL_SECONDS,
+                pool_size=settings.DATA_SQLITE_POOL_SIZE,
+            )
+        return DataRefresher(
+            settings.DATA_PATH,
+            snapshot_path=settings.DATA_SNAPSHOT_PATH,
+            drop_dir=settings.DATA_DROP_DIR,
+            poll_interval=settings.DATA_POLL_SECONDS,
+        )
+
+# Shared by all sessions; answers for teams changed by a data refresh are dropped
+@st.cache_resource(show_spinner=False)
+def get_response_cache():
+    cache = ResponseCache(
+        max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+        max_bytes=int(settings.RESPONSE_CACHE_MAX_MB * 1024 * 1024),
+        ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+        intent_max_entries=settings.INTENT_CACHE_MAX_ENTRIES,
+    )
+    load_data().subscribe(cache.invalidate_teams)
+    return cache
+
+# Shared PDF report renderer and cache
+@st.cache_resource(show_spinner=False)
+def get_report_engine():
+    engine = ReportEngine(max_workers=settings.REPORT_WORKERS, cache_size=settings.REPORT_CACHE_SIZE)
+    load_data().subscribe(engine.invalidate_teams)
+    return engine
+
+# One consistent snapshot for the whole rerun
+store = load_data().store
+
+# Chart figures and rendered images, shared by all sessions
+@st.cache_resource(show_spinner=False)
+def get_chart_renderer():
+    renderer = ChartRenderer(cache_size=settings.CHART_CACHE_SIZE)
+    load_data().subscribe(renderer.invalidate_teams)
+    return renderer
+
+# Incrementally fitted sprint forecasts, shared by all sessions
+@st.cache_resource(show_spinner=False)
+def get_forecaster():
+    from sprint_forecast import SprintForecaster
+
+    forecaster = SprintForecaster()
+    load_data().subscribe(forecaster.invalidate_teams)
+    return forecaster
+
+# Background chat workers shared by all sessions
+@st.cache_resource(show_spinner=False)
+def get_chat_pipeline():
+    return ChatPipeline(
+        max_workers=settings.CHAT_WORKERS,
+        max_pending=settings.CHAT_MAX_PENDING,
+        timeout_seconds=settings.CHAT_TIMEOUT_SECONDS,
+    )
+
+# Chat history of all sessions, kept within one memory budget
+@st.cache_resource(show_spinner=False)
+def get_history_budget():
+    return HistoryBudget(max_bytes=int(settings.CHAT_HISTORY_TOTAL_MB * 1024 * 1024))
+
+# Vectorized fleet-wide views, rebuilt once per data snapshot. The SQLite
+# store answers the same questions with SQL aggregates.
+@st.cache_resource(show_spinner=False, max_entries=2)
+def get_fleet_analytics(_store, version):
+    if settings.DATA_BACKEND == "sqlite":
+        return _store
+    from sprint_analytics import FleetAnalytics
+
+    return FleetAnalytics(_store)
+
+# Prometheus endpoint, once per process. With several app processes on one
+# host only the first binds the port.
+@st.cache_resource(show_spinner=False)
+def start_metrics_server():
+    if not (settings.METRICS_ENABLED and settings.METRICS_PORT):
+        return None
+    try:
+        return start_http_server(settings.METRICS_PORT, settings.METRICS_HOST)
+    except OSError:
+        return None
+
+start_metrics_server()
+
 def get_team_by_name(name):
-    return next((t for t in teams if t["team_name"].lower() == name.lower()), None)
- 
-def get_latest_sprint(team):
-    return team["sprints"][-1]
- 
-def get_last_n_velocities(team, n=3):
-    return [s["velocity"] for s in team["sprints"][-n:]]
- 
-def calculate_risk(team):
-    latest = get_latest_sprint(team)
-    risk_score = 0
-    if latest["blockers"] >= 4:
-        risk_score += 1
-    if latest["story_points_completed"] < 0.8 * latest["story_points_planned"]:
-        risk_score += 1
-    if latest["bugs_reported"] > 4:
-        risk_score += 1
-    return "🔴 High Risk" if risk_score >= 2 else "🟡 Moderate Risk" if risk_score == 1 else "🟢 Low Risk"
- 
-def get_teams_with_recent_sprint(days=7):
-    recent_teams = []
-    today = datetime.today()
-    cutoff = today - timedelta(days=days)
-    for team in teams:
-        last_sprint = get_latest_sprint(team)
-        end_date = last_sprint.get("end_date")
-        if end_date:
-            sprint_date = datetime.strptime(end_date, "%Y-%m-%d")
-            if sprint_date >= cutoff:
-                recent_teams.append(team)
-    return recent_teams
- 
-# Prediction function
-def predict_next_sprint(team, lookback=3):
-    sprints = team["sprints"][-lookback:]
-    avg_velocity = int(sum(s["velocity"] for s in sprints) / len(sprints))
-    avg_blockers = round(sum(s["blockers"] for s in sprints) / len(sprints), 1)
-    avg_bugs = round(sum(s["bugs_reported"] for s in sprints) / len(sprints), 1)
-    predicted_velocity = avg_velocity + random.randint(-2, 2)
-    predicted_blockers = max(0, avg_blockers + random.uniform(-1, 1))
-    predicted_bugs = max(0, avg_bugs + random.uniform(-1, 1))
-    return predicted_velocity, round(predicted_blockers, 1), round(predicted_bugs, 1)
+    return store.get_team(name)
  
 # Plot functions
+@STAGE_SECONDS.timed(stage="chart")
+def show_chart(kind, team):
+    renderer = get_chart_renderer()
+    if settings.CHART_BACKEND == "vega":
+        st.vega_lite_chart(renderer.spec(kind, team), use_container_width=True)
+    else:
+        st.image(renderer.render(kind, team, store.data_version([team])))
+ 
 def plot_velocity(team):
-    sprints = team["sprints"]
-    x = [f"Sprint {s['sprint_id']}" for s in sprints]
-    y = [s["velocity"] for s in sprints]
-    fig, ax = plt.subplots()
-    ax.plot(x, y, marker='o', linewidth=2)
-    ax.set_title(f"Velocity Over Time – {team['team_name']}")
-    ax.set_ylabel("Story Points")
-    ax.set_xlabel("Sprint")
-    ax.grid(True)
-    st.pyplot(fig)
+    show_chart(VELOCITY, team)
  
 def plot_blockers_bugs(team):
-    sprints = team["sprints"]
-    x = [f"Sprint {s['sprint_id']}" for s in sprints]
-    blockers = [s["blockers"] for s in sprints]
-    bugs = [s["bugs_reported"] for s in sprints]
-    fig, ax = plt.subplots()
-    ax.bar(x, blockers, label="Blockers", alpha=0.7)
-    ax.bar(x, bugs, bottom=blockers, label="Bugs", alpha=0.7)
-    ax.set_title(f"Blockers & Bugs – {team['team_name']}")
-    ax.set_ylabel("Count")
-    ax.set_xlabel("Sprint")
-    ax.legend()
-    st.pyplot(fig)
+    show_chart(BLOCKERS_BUGS, team)
  
 def plot_completion_ratio(team):
-    sprints = team["sprints"]
-    x = [f"Sprint {s['sprint_id']}" for s in sprints]
-    completed = [s["story_points_completed"] for s in sprints]
-    planned = [s["story_points_planned"] for s in sprints]
-    fig, ax = plt.subplots()
-    ax.plot(x, completed, label="Completed", marker='o')
-    ax.plot(x, planned, label="Planned", linestyle='--', marker='x')
-    ax.set_title(f"Planned vs Completed – {team['team_name']}")
-    ax.set_ylabel("Story Points")
-    ax.set_xlabel("Sprint")
-    ax.legend()
-    ax.grid(True)
-    st.pyplot(fig)
- 
-# PDF Export
-def export_pdf_report(team):
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
-    c = canvas.Canvas(temp_file.name, pagesize=A4)
-    width, height = A4
-    c.setFont("Helvetica-Bold", 16)
-    c.drawString(50, height - 50, f"DevOps Sprint Report – {team['team_name']}")
-    latest = get_latest_sprint(team)
-    text = f"""
-    Sprint ID: {latest['sprint_id']}
-    Planned Story Points: {latest['story_points_planned']}
-    Completed Story Points: {latest['story_points_completed']}
-    Velocity: {latest['velocity']}
-    Blockers: {latest['blockers']}
-    Bugs Reported: {latest['bugs_reported']}
-    Risk Level: {calculate_risk(team)}
-    """
-    c.setFont("Helvetica", 11)
-    y = height - 100
-    for line in text.strip().split("\n"):
-        c.drawString(50, y, line.strip())
-        y -= 20
-    c.showPage()
-    c.save()
-    return temp_file.name
+    show_chart(COMPLETION_RATIO, team)
  
 # Intent Detection + Chatbot Logic
-def detect_intent(user_input):
-    candidate_labels = [
-        "sprint status", "user story assignment", "user story duration", "bug tracking",
-        "sprint prediction", "team members", "list teams", "export report"
-    ]
-    result = classifier(user_input, candidate_labels)
+def zero_shot_intent(user_input, candidate_labels):
+    with STAGE_SECONDS.time(stage="model"):
+        result = get_classifier()(user_input, candidate_labels)
     return result['labels'][0], result['scores'][0]
- 
-def generate_response_with_nlp(user_input):
-    intent, score = detect_intent(user_input)
-    user_input_lower = user_input.lower()
+
+# Returns (intent, score, tier) where tier tells which router stage answered
+def detect_intent(user_input):
+    with STAGE_SECONDS.time(stage="intent"):
+        intent, score, tier = route_intent(user_input, zero_shot_intent)
+    INTENTS.inc(intent=intent, tier=tier)
+    INTENT_CONFIDENCE.observe(score, tier=tier)
+    return intent, score, tier
+ 
+# Runs on a chat worker thread. `report(status)` publishes progress to the UI
+# (and stops the job if the question was superseded). `context` is the chat's
+# last team / story, used for follow-ups that do not name one. Returns
+# (reply, chart_team, (intent, score, tier), entities).
+@STAGE_SECONDS.timed(stage="question")
+def generate_response_with_nlp(user_input, report=lambda status: None, context=None):
+    QUESTIONS.inc()
+    cache = get_response_cache()
+    query = normalize_query(user_input)
+    detected = cache.intents.get(query)
+    CACHE_LOOKUPS.inc(cache="intent", result="miss" if detected is MISSING else "hit")
+    if detected is MISSING:
+        if not model_future.done():
+            report("Detecting intent (NLP model still loading)...")
+        else:
+            report("Detecting intent...")
+        detected = detect_intent(user_input)
+        cache.intents.put(query, detected)
+    intent, score, tier = detected
  
     if score < 0.7:
-        return "I'm not quite sure what you mean. Can you rephrase?", None
- 
+        LOW_CONFIDENCE.inc()
+        return "I'm not quite sure what you mean. Can you rephrase?", None, detected, None
+
+    report(f"Looking up {intent}...")
+    # Follow-ups that refer back ("its", "that team") skip entity extraction.
+    # Questions where extraction finds nothing fall back to the context unless
+    # they name an (unknown) team or work item and do not refer back.
+    has_context = context is not None and not context.empty()
+    follow_up = has_context and is_follow_up(user_input)
+    named = has_context and names_entity(user_input)
+    from_context = follow_up and not named
+    with STAGE_SECONDS.time(stage="entities"):
+        if from_context:
+            entities = context.entities(store)
+        else:
+            entities = store.extract_entities(user_input)
+            if has_context and (follow_up or not named) and not (entities.teams or entities.stories or entities.bugs):
+                entities, from_context = context.entities(store), True
+    if intent in UNCACHED_INTENTS:
+        return build_response(intent, entities, user_input) + (detected, entities)
+
+    # Answers about specific teams only go stale when those teams change
+    mentioned = [e.team for e in entities.teams + entities.stories + entities.bugs]
+    version = store.version if intent == "list teams" else store.data_version(mentioned)
+    key = cache.answer_key(query, intent, version, date.today(), context.key() if from_context else None)
+    response = cache.answers.get(key)
+    CACHE_LOOKUPS.inc(cache="answer", result="miss" if response is MISSING else "hit")
+    if response is MISSING:
+        response = build_response(intent, entities, user_input)
+        cache.answers.put(key, response, tags={t.team_name for t in mentioned})
+    return response + (detected, entities)
+
+@STAGE_SECONDS.timed(stage="answer")
+def build_response(intent, entities, user_input):
     if intent == "list teams":
-        return "📋 Here are the available teams: " + ", ".join([t["team_name"] for t in teams]), None
+        text = user_input.lower()
+        analytics = get_fleet_analytics(store, store.version)
+        if "high risk" in text or "high-risk" in text or "at risk" in text:
+            names = analytics.teams_with_risk()
+            return "🔴 High-risk teams: " + (", ".join(names) or "none 🎉"), None
+        if "miss" in text:
+            names = analytics.teams_forecast_to_miss()
+            return "📉 Teams forecast to miss their plan next sprint: " + (", ".join(names) or "none 🎉"), None
+        if "this week" in text or "ended" in text or "recent" in text:
+            names = analytics.teams_with_recent_sprint(days=7)
+            return "🗓️ Teams whose sprint ended in the last 7 days: " + (", ".join(names) or "none"), None
+        return "📋 Here are the available teams: " + ", ".join(store.team_names()), None
  
     if intent == "user story assignment":
-        for team in teams:
-            for story in team.get("user_stories", []):
-                if story["id"].lower() in user_input_lower:
-                    return f"🧠 User story **{story['id']}** is assigned to **{story['assigned_to']}** in Team {team['team_name']}.", None
+        if entities.story:
+            story, team = entities.story.record, entities.story.team
+            return f"🧠 User story **{story.id}** is assigned to **{story.assigned_to}** in Team {team.team_name}.", None
         return "❓ I couldn’t find that user story ID.", None
  
     if intent == "user story duration":
-        for team in teams:
-            for story in team.get("user_stories", []):
-                if story["id"].lower() in user_input_lower:
-                    opened_date = datetime.strptime(story["opened_date"], "%Y-%m-%d")
-                    days_open = (datetime.today() - opened_date).days
-                    return f"⏳ User story **{story['id']}** has been open for **{days_open} days**.", None
+        if entities.story:
+            story = entities.story.record
+            opened_date = datetime.strptime(story.opened_date, "%Y-%m-%d")
+            days_open = (datetime.today() - opened_date).days
+            return f"⏳ User story **{story.id}** has been open for **{days_open} days**.", None
         return "❓ I couldn’t find that user story ID.", None
  
+    if entities.team is None:
+        return "🤔 Not sure how to help with that yet. Try asking something else?", None
+    team = entities.team.record
+
     if intent == "bug tracking":
-        for team in teams:
-            if team["team_name"].lower() in user_input_lower:
-                bugs = team.get("bugs", [])
-                open_bugs = [b for b in bugs if b["status"].lower() == "open"]
-                closed_bugs = [b for b in bugs if b["status"].lower() == "closed"]
-                return (
-                    f"🐞 Bug Tracker for Team {team['team_name']}:\n"
-                    f"- Open: {len(open_bugs)}\n"
-                    f"- Closed: {len(closed_bugs)}\n"
-                    f"Keep squashing them! 💪",
-                    None
-                )
- 
-    for team in teams:
-        name = team["team_name"].lower()
-        if name in user_input_lower:
-            if intent == "sprint status":
-                sprint = get_latest_sprint(team)
-                response = (
-                    f"📊 *Sprint Overview for {team['team_name']} (Sprint {sprint['sprint_id']})*\n\n"
-                    f"🗂️ Planned: {sprint['story_points_planned']} SP\n"
-                    f"✅ Completed: {sprint['story_points_completed']} SP\n"
-                    f"⚡ Velocity: {sprint['velocity']}\n"
-                    f"🪤 Blockers: {sprint['blockers']} | 🐞 Bugs: {sprint['bugs_reported']}\n"
-                    f"🚦 Risk Level: {calculate_risk(team)}"
-                )
-                return response, None
- 
-            elif intent == "sprint prediction":
-                predicted_velocity, predicted_blockers, predicted_bugs = predict_next_sprint(team)
-                return (
-                    f"🔮 *Sprint Forecast for {team['team_name']}*\n\n"
-                    f"- **Predicted Velocity**: {predicted_velocity} SP\n"
-                    f"- **Expected Blockers**: {predicted_blockers}\n"
-                    f"- **Expected Bugs**: {predicted_bugs}\n\n"
-                    f"Plan accordingly and let's aim high! 🚀",
-                    None
-                )
- 
-            elif intent == "team members":
-                members = [f"👤 {m['name']} – *{m['role']}*" for m in team["members"]]
-                return f"👥 Here's the lineup for Team {team['team_name']}:\n" + "\n".join(members), None
+        open_bugs, closed_bugs = store.get_bug_counts(team)
+        return (
+            f"🐞 Bug Tracker for Team {team.team_name}:\n"
+            f"- Open: {open_bugs}\n"
+            f"- Closed: {closed_bugs}\n"
+            f"Keep squashing them! 💪",
+            None
+        )
+ 
+    if intent == "sprint status":
+        sprint = get_latest_sprint(team)
+        response = (
+            f"📊 *Sprint Overview for {team.team_name} (Sprint {sprint.sprint_id})*\n\n"
+            f"🗂️ Planned: {sprint.story_points_planned} SP\n"
+            f"✅ Completed: {sprint.story_points_completed} SP\n"
+            f"⚡ Velocity: {sprint.velocity}\n"
+            f"🪤 Blockers: {sprint.blockers} | 🐞 Bugs: {sprint.bugs_reported}\n"
+            f"🚦 Risk Level: {calculate_risk(team)}"
+        )
+        return response, None
+ 
+    elif intent == "sprint prediction":
+        forecast = get_forecaster().forecast(team, store.data_version([team]))
+        return (
+            f"🔮 *Sprint Forecast for {team.team_name}*\n\n"
+            f"- **Predicted Velocity**: {forecast.velocity} SP "
+            f"(80% range {forecast.velocity_low}–{forecast.velocity_high} SP)\n"
+            f"- **Velocity Trend**: {forecast.trend_velocity} SP\n"
+            f"- **Expected Blockers**: {forecast.blockers}\n"
+            f"- **Expected Bugs**: {forecast.bugs}\n\n"
+            f"Plan accordingly and let's aim high! 🚀",
+            None
+        )
+ 
+    elif intent == "team members":
+        members = [f"👤 {m.name} – *{m.role}*" for m in team.members]
+        return f"👥 Here's the lineup for Team {team.team_name}:\n" + "\n".join(members), None
  
     return "🤔 Not sure how to help with that yet. Try asking something else?", None
  
 # Streamlit UI
-st.set_page_config(page_title="DevOps Copilot", layout="centered")
-st.title("🤖 DevOps Assistant – Sprint Intelligence Demo")
+if model_future.done() and model_future.exception() is None:
+    st.sidebar.success("✅ NLP model ready")
+elif model_future.done():
+    st.sidebar.error("⚠️ NLP model failed to load")
+else:
+    st.sidebar.info("⏳ NLP model warming up...")
+
+with st.sidebar.expander("📈 Response cache"):
+    st.json(get_response_cache().stats())
+with st.sidebar.expander("🧵 Chat workers"):
+    st.json(get_chat_pipeline().stats())
+with st.sidebar.expander("⏱️ Startup"):
+    st.json(PROFILE.as_dict())
+with st.sidebar.expander("💬 Chat history"):
+    st.json(get_history_budget().stats())
+if settings.METRICS_ADMIN_PANEL and REGISTRY.enabled:
+    with st.sidebar.expander("📊 Metrics"):
+        questions = QUESTIONS.total()
+        st.metric("Questions", questions)
+        st.metric("Low-confidence rate", f"{LOW_CONFIDENCE.total() / questions:.1%}" if questions else "–")
+        st.json(REGISTRY.snapshot())
  
 st.markdown("Ask questions like:")
 st.markdown("- *What is the sprint status of Team Alpha*")
@@ -231,50 +370,143 @@ st.markdown("- *How should Team Alpha's next sprint look like?*")
 st.markdown("- *How long has US-101 been open?*")
 st.markdown("- *What is the bug progress for Team Gamma?*")
  
-user_input = st.text_input("Ask something:", "")
- 
+if "session_id" not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
+    st.session_state.chat = get_history_budget().new_session(
+        max_turns=settings.CHAT_HISTORY_MAX_TURNS,
+        max_bytes=int(settings.CHAT_HISTORY_MAX_KB * 1024),
+    )
+chat = st.session_state.chat
+
+if st.sidebar.button("🧹 New conversation"):
+    get_chat_pipeline().cancel_session(st.session_state.session_id)
+    st.session_state.chat_job = None
+    chat.clear()
+
+# A new question goes to the chat workers and supersedes the previous one
+user_input = st.chat_input("Ask something...")
 if user_input:
-    st.markdown("🧠 Thinking...")
-    reply, chart_team = generate_response_with_nlp(user_input)
-    st.markdown(f"**Assistant:**\n\n{reply}")
- 
-    if chart_team:
-        plot_velocity(chart_team)
-        plot_blockers_bugs(chart_team)
-        plot_completion_ratio(chart_team)
+    context = chat.context
+    try:
+        st.session_state.chat_job = get_chat_pipeline().submit(
+            st.session_state.session_id,
+            user_input,
+            lambda query, report: generate_response_with_nlp(query, report, context),
+        )
+    except QueueFull:
+        st.warning("⏳ Still working on your earlier questions, please try again in a moment.")
+
+# Moves a finished job into the conversation history
+def record_chat_job():
+    job = st.session_state.get("chat_job")
+    if job is None:
+        return
+    job.check_timeout()
+    if not job.done():
+        return
+    st.session_state.chat_job = None
+    state = job.state()
+    if state == CANCELLED:
+        return
+    if state == TIMED_OUT:
+        chat.add_turn(ChatTurn(job.query, f"⏱️ No answer after {job.elapsed():.0f}s. Please try again or rephrase."))
+    elif state == FAILED and model_future.done() and job.future.exception() is model_future.exception():
+        chat.add_turn(ChatTurn(job.query, "⚠️ Failed to load NLP model. Please check internet connection or environment configuration."))
+    elif state == FAILED:
+        # Anything but the model failing to load (that error is re-raised as is)
+        error = job.future.exception()
+        logger.error("Answering %r failed", job.query, exc_info=(type(error), error, error.__traceback__))
+        chat.add_turn(ChatTurn(job.query, "⚠️ Something went wrong while answering. Please try again."))
+    else:
+        reply, chart_team, (intent, score, tier), entities = job.result()
+        chart_name = chart_team.team_name if chart_team else None
+        chat.add_turn(ChatTurn(job.query, reply, intent, score, tier, chart_name), entities)
+    get_history_budget().enforce()
+
+record_chat_job()
+
+history = chat.history()
+for i, turn in enumerate(history):
+    with st.chat_message("user"):
+        st.markdown(turn.question)
+    with st.chat_message("assistant"):
+        if turn.intent:
+            st.caption(f"Intent: {turn.intent} ({turn.score:.2f}, answered by {turn.tier} tier)")
+        st.markdown(turn.reply)
+        # Charts only for the latest answer
+        chart_team = get_team_by_name(turn.chart_team) if turn.chart_team and i == len(history) - 1 else None
+        if chart_team:
+            plot_velocity(chart_team)
+            plot_blockers_bugs(chart_team)
+            plot_completion_ratio(chart_team)
+
+# Polls the running job so only this fragment reruns; once it finishes a full
+# rerun records the answer and redraws the page without the polling timer
+def show_chat_job():
+    job = st.session_state.get("chat_job")
+    if job is None:
+        return
+    if job.check_timeout() or job.done():
+        st.rerun()
+    with st.chat_message("user"):
+        st.markdown(job.query)
+    with st.chat_message("assistant"):
+        st.markdown(f"🧠 {job.status}")
+
+chat_pending = st.session_state.get("chat_job") is not None
+st.fragment(show_chat_job, run_every=settings.CHAT_POLL_SECONDS if chat_pending else None)()
  
 # PDF Export
 with st.expander("📄 Export Sprint Report"):
-    team_names = [t["team_name"] for t in teams]
+    team_names = store.team_names()
     selected_team = st.selectbox("Select a team", team_names)
     if st.button("Export Report as PDF"):
         team_obj = get_team_by_name(selected_team)
         if team_obj:
-            pdf_path = export_pdf_report(team_obj)
-            with open(pdf_path, "rb") as f:
-                st.download_button(
-                    label="📥 Download Sprint Report",
-                    data=f,
-                    file_name=f"{selected_team}_Sprint_Report.pdf",
-                    mime="application/pdf"
-                )
-            os.remove(pdf_path)
+            st.download_button(
+                label="📥 Download Sprint Report",
+                data=get_report_engine().render(team_obj),
+                file_name=report_file_name(team_obj),
+                mime="application/pdf"
+            )
  
 # Auto-generate weekly reports
 with st.expander("🗓️ Auto-Generate Weekly Reports"):
     st.markdown("This generates reports for teams whose sprints ended in the last 7 days.")
     if st.button("Generate Weekly Reports"):
-        recent_teams = get_teams_with_recent_sprint()
+        recent_names = get_fleet_analytics(store, store.version).teams_with_recent_sprint(days=7)
+        recent_teams = [get_team_by_name(name) for name in recent_names]
         if not recent_teams:
             st.info("No teams had sprints ending this week.")
         else:
-            for team in recent_teams:
-                pdf_path = export_pdf_report(team)
-                with open(pdf_path, "rb") as f:
-                    st.download_button(
-                        label=f"📥 Download {team['team_name']} Sprint Report",
-                        data=f,
-                        file_name=f"{team['team_name']}_Sprint_Report.pdf",
-                        mime="application/pdf"
-                    )
-                os.remove(pdf_path)
+            progress = st.progress(0.0, text="Rendering reports...")
+            archive, failed = get_report_engine().build_zip(
+                recent_teams,
+                progress=lambda done, total: progress.progress(done / total, text=f"Rendered {done}/{total} reports"),
+            )
+            for team, error in failed:
+                logger.error("Report for %s failed", team.team_name, exc_info=(type(error), error, error.__traceback__))
+            if failed:
+                st.warning("⚠️ Could not render the reports of: " + ", ".join(team.team_name for team, _ in failed))
+            if len(failed) < len(recent_teams):
+                st.download_button(
+                    label=f"📥 Download {len(recent_teams) - len(failed)} Sprint Reports (ZIP)",
+                    data=archive,
+                    file_name=f"Weekly_Sprint_Reports_{date.today().isoformat()}.zip",
+                    mime="application/zip"
+                )
+
+# After the first render: time it, then import the heavy modules in the
+# background so the first chart, forecast or PDF does not pay for them
+PROFILE.record("first render", time.perf_counter() - script_started)
+
+@st.cache_resource(show_spinner=False)
+def start_module_warmup():
+    if not settings.WARMUP_IMPORTS:
+        return None
+    modules = [m for m in WARMUP_MODULES if settings.CHART_BACKEND != "vega" or not m.startswith("matplotlib")]
+    thread = threading.Thread(target=warm_up_modules, args=(modules,), name="import-warmup", daemon=True)
+    thread.start()
+    return thread
+
+start_module_warmup()
@@ -0,0 +1,99 @@
+import json
+import random
+from datetime import date, timedelta
+
+# Synthetic tracker exports in the Data.json format, for benchmarks and load
+# tests. Output is deterministic for a given seed. Teams are named after Greek
+# letters ("Team Alpha", then "Team Alpha 2", ...), story IDs run from US-1000
+# and bug IDs from BUG-1000, so every ID is unique across teams.
+
+GREEK_LETTERS = [
+    "Alpha", "Beta", "Gamma", "Delta", "Epsilon", "Zeta", "Eta", "Theta", "Iota", "Kappa", "Lambda", "Mu",
+    "Nu", "Xi", "Omicron", "Pi", "Rho", "Sigma", "Tau", "Upsilon", "Phi", "Chi", "Psi", "Omega",
+]
+FIRST_NAMES = ["Alice", "Bob", "Charlie", "Dana", "Eli", "Fatima", "Grace", "Hiro", "Ines", "Jamal", "Kira", "Luis"]
+ROLES = ["Scrum Master", "Developer", "Developer", "Developer", "QA Engineer", "Product Owner"]
+STORY_STATUSES = ["To Do", "In Progress", "In Review", "Done"]
+BUG_STATUSES = ["Open", "In Progress", "Closed"]
+TITLE_VERBS = ["Implement", "Refactor", "Fix", "Document", "Automate", "Migrate"]
+TITLE_NOUNS = ["login flow", "billing export", "search index", "audit log", "deploy pipeline", "user settings"]
+
+SPRINT_DAYS = 14
+
+
+def team_name(i):
+    letter = GREEK_LETTERS[i % len(GREEK_LETTERS)]
+    cycle = i // len(GREEK_LETTERS)
+    return f"Team {letter}" if cycle == 0 else f"Team {letter} {cycle + 1}"
+
+
+def work_item(rng, item_id, kind, members, statuses, today):
+    opened = today - timedelta(days=rng.randint(0, 365))
+    return {
+        "id": item_id,
+        "title": f"{rng.choice(TITLE_VERBS)} {rng.choice(TITLE_NOUNS)}",
+        "assigned_to": rng.choice(members)["name"],
+        "status": rng.choice(statuses),
+        "opened_date": opened.isoformat(),
+        "cycle_time_days": rng.randint(1, 30),
+        "work_item_type": kind,
+    }
+
+
+# One {"teams": [...]} document. The last sprint of every team ends within
+# the last `SPRINT_DAYS` days before `today`, like a live tracker.
+def generate_data(teams=2, stories_per_team=3, bugs_per_team=2, sprints_per_team=3, members_per_team=4,
+                  seed=0, today=None):
+    rng = random.Random(seed)
+    today = today or date.today()
+    story_id = bug_id = 1000
+    result = []
+    for i in range(teams):
+        members = [
+            {"name": f"{rng.choice(FIRST_NAMES)} {i}-{m}", "role": ROLES[m % len(ROLES)]}
+            for m in range(members_per_team)
+        ]
+        last_end = today - timedelta(days=rng.randint(0, SPRINT_DAYS - 1))
+        sprints = []
+        for s in range(sprints_per_team):
+            end = last_end - timedelta(days=SPRINT_DAYS * (sprints_per_team - 1 - s))
+            planned = rng.randint(20, 50)
+            completed = max(0, planned - rng.randint(-3, 12))
+            sprints.append({
+                "sprint_id": s + 1,
+                "start_date": (end - timedelta(days=SPRINT_DAYS - 1)).isoformat(),
+                "end_date": end.isoformat(),
+                "story_points_planned": planned,
+                "story_points_completed": completed,
+                "velocity": completed,
+                "blockers": rng.randint(0, 6),
+                "bugs_reported": rng.randint(0, 7),
+            })
+        stories = []
+        for _ in range(stories_per_team):
+            stories.append(work_item(rng, f"US-{story_id}", "User Story", members, STORY_STATUSES, today))
+            story_id += 1
+        bugs = []
+        for _ in range(bugs_per_team):
+            bugs.append(work_item(rng, f"BUG-{bug_id}", "Bug", members, BUG_STATUSES, today))
+            bug_id += 1
+        result.append({
+            "team_name": team_name(i),
+            "members": members,
+            "sprints": sprints,
+            "user_stories": stories,
+            "bugs": bugs,
+        })
+    return {"teams": result}
+
+
+# Writes `data` as a JSON document, or as NDJSON (one team per line) when the
+# path ends in .ndjson / .jsonl
+def write_data(data, path):
+    with open(path, "w", encoding="utf-8") as f:
+        if path.endswith((".ndjson", ".jsonl")):
+            for team in data["teams"]:
+                f.write(json.dumps(team, ensure_ascii=False))
+                f.write("\n")
+        else:
+            json.dump(data, f, ensure_ascii=False)
@@ -0,0 +1,43 @@
+import json
+import os
+import sys
+
+import pytest
+
+# The app modules are top-level modules in the directory above
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def make_team():
+    def make(name, velocity=20, stories=(), bugs=()):
+        return {
+            "team_name": name,
+            "members": [{"name": "Alice", "role": "Developer"}],
+            "sprints": [{
+                "sprint_id": 1, "start_date": "2024-01-01", "end_date": "2024-01-14",
+                "story_points_planned": 25, "story_points_completed": velocity, "velocity": velocity,
+                "blockers": 1, "bugs_reported": 2,
+            }],
+            "user_stories": [{"id": story_id, "title": "Story", "assigned_to": "Alice", "status": "Open",
+                              "opened_date": "2024-01-02", "cycle_time_days": 3, "work_item_type": "User Story"}
+                             for story_id in stories],
+            "bugs": [{"id": bug_id, "title": "Bug", "assigned_to": "Alice", "status": "Open",
+                      "opened_date": "2024-01-02", "cycle_time_days": 1, "work_item_type": "Bug"}
+                     for bug_id in bugs],
+        }
+    return make
+
+
+# Writes JSON and moves the file's mtime forward, so a rewrite within the same
+# clock tick still changes its (size, mtime_ns) signature
+@pytest.fixture
+def write_json():
+    def write(path, data):
+        previous = os.stat(path).st_mtime_ns if os.path.exists(path) else None
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(data if isinstance(data, str) else json.dumps(data))
+        if previous is not None:
+            os.utime(path, ns=(previous + 10**9, previous + 10**9))
+        return path
+    return write
@@ -0,0 +1,71 @@
+import threading
+
+import pytest
+
+from chat_pipeline import CANCELLED, DONE, RUNNING, ChatPipeline, QueueFull
+
+WAIT = 5
+
+
+@pytest.fixture
+def pipeline():
+    pipeline = ChatPipeline(max_workers=4, max_pending=2, timeout_seconds=None)
+    yield pipeline
+    pipeline.close()
+
+
+# Job function that signals once it runs and then waits for `release`
+def blocking(started, release, answer="answer"):
+    def fn(query, report):
+        started.set()
+        assert release.wait(WAIT)
+        report("Answering...")
+        return answer
+    return fn
+
+
+def test_new_question_supersedes_running_one(pipeline):
+    started, release = threading.Event(), threading.Event()
+    first = pipeline.submit("s1", "first", blocking(started, release))
+    assert started.wait(WAIT)
+    second = pipeline.submit("s1", "second", lambda query, report: query.upper())
+    assert second.future.result(WAIT) == "SECOND"
+    assert first.superseded.is_set()
+    release.set()
+    first.future.exception(WAIT)  # stopped at its report() checkpoint
+    assert first.state() == CANCELLED
+    assert second.state() == DONE
+
+
+def test_queued_question_is_cancelled_outright():
+    pipeline = ChatPipeline(max_workers=1, max_pending=1, timeout_seconds=None)
+    try:
+        started, release = threading.Event(), threading.Event()
+        pipeline.submit("other", "busy", blocking(started, release))
+        assert started.wait(WAIT)
+        queued = pipeline.submit("s1", "first", lambda query, report: query)
+        latest = pipeline.submit("s1", "second", lambda query, report: query)
+        assert queued.future.cancelled()
+        assert queued.state() == CANCELLED
+        release.set()
+        assert latest.future.result(WAIT) == "second"
+    finally:
+        pipeline.close()
+
+
+# A superseded job that is still running counts against max_pending
+def test_queue_full_leaves_earlier_jobs_untouched(pipeline):
+    release = threading.Event()
+    started = [threading.Event(), threading.Event()]
+    first = pipeline.submit("s1", "first", blocking(started[0], release))
+    assert started[0].wait(WAIT)
+    second = pipeline.submit("s1", "second", blocking(started[1], release))
+    assert started[1].wait(WAIT)
+    with pytest.raises(QueueFull):
+        pipeline.submit("s1", "third", lambda query, report: query)
+    assert first.superseded.is_set()
+    assert not second.superseded.is_set()
+    assert second.state() == RUNNING
+    release.set()
+    assert second.future.result(WAIT) == "answer"
+    assert second.state() == DONE
@@ -0,0 +1,75 @@
+import os
+
+import pytest
+
+from data_refresh import APPLIED_DIR, FAILED_DIR, DataRefresher
+
+
+@pytest.fixture
+def data_path(tmp_path, make_team, write_json):
+    return write_json(str(tmp_path / "Data.json"), {"teams": [make_team("Team Alpha"), make_team("Team Beta")]})
+
+
+@pytest.fixture
+def drop_dir(tmp_path):
+    path = tmp_path / "drops"
+    path.mkdir()
+    return path
+
+
+def velocity(store, name):
+    return store.get_team(name).sprints[-1].velocity
+
+
+def test_bad_delta_is_quarantined_and_later_deltas_apply(data_path, drop_dir, make_team, write_json):
+    refresher = DataRefresher(data_path, drop_dir=str(drop_dir), poll_interval=0)
+    write_json(str(drop_dir / "01-bad.json"), '{"teams": [')
+    write_json(str(drop_dir / "02-good.json"), {"teams": [make_team("Team Gamma")]})
+
+    assert refresher.refresh() == {"Team Gamma"}
+    assert refresher.store.get_team("Team Gamma") is not None
+    assert os.listdir(drop_dir / FAILED_DIR) == ["01-bad.json"]
+    assert os.listdir(drop_dir / APPLIED_DIR) == ["02-good.json"]
+    assert [name for name, _ in refresher.failed_deltas] == ["01-bad.json"]
+    assert refresher.refresh() == set()
+
+
+def test_delta_applies_on_top_of_reloaded_data_file(data_path, drop_dir, make_team, write_json):
+    refresher = DataRefresher(data_path, drop_dir=str(drop_dir), poll_interval=0)
+    version = refresher.store.version
+    write_json(data_path, {"teams": [make_team("Team Alpha", velocity=10), make_team("Team Beta")]})
+    write_json(str(drop_dir / "01.json"), {"teams": [make_team("Team Beta", velocity=30)]})
+
+    assert refresher.refresh() == {"Team Alpha", "Team Beta"}
+    store = refresher.store
+    assert (velocity(store, "Team Alpha"), velocity(store, "Team Beta")) == (10, 30)
+    assert store.version == version + 1
+    assert refresher.refresh() == set()
+
+
+def test_failed_reload_keeps_deltas_and_retries(data_path, drop_dir, make_team, write_json):
+    refresher = DataRefresher(data_path, drop_dir=str(drop_dir), poll_interval=0)
+    old_store = refresher.store
+    write_json(data_path, '{"teams": [')
+    write_json(str(drop_dir / "01.json"), {"removed_teams": ["Team Beta"]})
+
+    with pytest.raises(ValueError):
+        refresher.refresh()
+    assert refresher.store is old_store
+    assert os.listdir(drop_dir) == ["01.json"]
+
+    write_json(data_path, {"teams": [make_team("Team Alpha", velocity=12), make_team("Team Beta")]})
+    assert refresher.refresh() == {"Team Alpha", "Team Beta"}
+    assert velocity(refresher.store, "Team Alpha") == 12
+    assert refresher.store.get_team("Team Beta") is None
+    assert os.listdir(drop_dir / APPLIED_DIR) == ["01.json"]
+
+
+def test_subscribers_get_changed_teams_after_swap(data_path, drop_dir, make_team, write_json):
+    refresher = DataRefresher(data_path, drop_dir=str(drop_dir), poll_interval=0)
+    calls = []
+    refresher.subscribe(lambda changed, store: calls.append((changed, store is refresher.store)))
+    write_json(str(drop_dir / "01.ndjson"), '{"team_name": "Team Delta", "sprints": []}\n')
+
+    refresher.refresh()
+    assert calls == [({"Team Delta"}, True)]
@@ -0,0 +1,62 @@
+import pytest
+
+from sqlite_store import SqliteRefresher, SqliteSprintStore, import_data
+
+
+@pytest.fixture
+def data_path(tmp_path, make_team, write_json):
+    return write_json(str(tmp_path / "Data.json"), {"teams": [
+        make_team("Team Alpha", stories=["US-1"], bugs=["BUG-1"]),
+        make_team("Team Beta", bugs=["BUG-2"]),
+    ]})
+
+
+@pytest.fixture
+def refresher(tmp_path, data_path):
+    refresher = SqliteRefresher(str(tmp_path / "sprints.db"), source_path=data_path, poll_interval=0)
+    yield refresher
+    for store in (refresher.store, refresher.previous):
+        if store is not None:
+            store.close()
+
+
+def test_store_answers_from_imported_data(tmp_path, data_path):
+    db_path = str(tmp_path / "sprints.db")
+    import_data(data_path, db_path)
+    store = SqliteSprintStore(db_path)
+    try:
+        assert store.team_names() == ["Team Alpha", "Team Beta"]
+        assert store.get_team("team alpha").sprints[-1].velocity == 20
+        story, team = store.find_story("us-1")
+        assert (story.id, team.team_name) == ("US-1", "Team Alpha")
+        assert store.get_bug_counts(team) == (1, 0)
+    finally:
+        store.close()
+
+
+def test_refresh_swaps_in_reimported_data(refresher, data_path, make_team, write_json):
+    old_store = refresher.store
+    assert refresher.refresh() == set()
+    assert refresher.store is old_store
+
+    write_json(data_path, {"teams": [make_team("Team Alpha", velocity=8), make_team("Team Beta", bugs=["BUG-2"])]})
+    assert refresher.refresh() == {"Team Alpha"}
+    assert refresher.store is not old_store
+    assert refresher.store.get_team("Team Alpha").sprints[-1].velocity == 8
+    assert refresher.store.data_version([refresher.store.get_team("Team Beta")]) == (1,)
+    # Still open for requests that read the old store before the swap
+    assert old_store.query("SELECT COUNT(*) FROM teams") == [(2,)]
+
+
+def test_replaced_store_is_closed_on_next_swap(refresher, data_path, make_team, write_json):
+    first = refresher.store
+    write_json(data_path, {"teams": [make_team("Team Alpha", velocity=8)]})
+    refresher.refresh()
+    second = refresher.store
+    write_json(data_path, {"teams": [make_team("Team Alpha", velocity=9)]})
+    refresher.refresh()
+
+    with pytest.raises(RuntimeError):
+        first.query("SELECT 1")
+    assert second.query("SELECT COUNT(*) FROM teams") == [(1,)]
+    assert refresher.store.get_team("Team Alpha").sprints[-1].velocity == 9
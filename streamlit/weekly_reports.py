@@ -0,0 +1,159 @@
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+from data_ingest import load_store
+from reports import export_pdf_report, report_cache_key, report_file_name
+from sprint_data import calculate_risk, get_latest_sprint, get_teams_with_recent_sprint
+
+# Headless weekly report run for schedulers (cron, CI), without Streamlit or
+# the NLP model:
+#
+#   python weekly_reports.py --out reports/            # sprints ended in the last 7 days
+#   python weekly_reports.py --since 2024-04-01 --until 2024-04-14 --out reports/
+#
+# Reports whose inputs did not change since the last run into the same output
+# directory are skipped (tracked in MANIFEST_NAME). A JSON run summary with
+# timings goes to stdout and, with --summary, to a file.
+
+MANIFEST_NAME = ".report_manifest.json"
+
+
+def parse_date(value):
+    return datetime.strptime(value, "%Y-%m-%d")
+
+
+def report_fingerprint(team):
+    return hashlib.sha256(repr(report_cache_key(team)).encode("utf-8")).hexdigest()
+
+
+def read_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST_NAME), "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_file(path, data, mode="wb"):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, mode) as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def render_reports(teams, workers):
+    if workers == 1 or len(teams) < 2:
+        for team in teams:
+            try:
+                yield team, export_pdf_report(team), None
+            except Exception as e:
+                yield team, None, e
+        return
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(workers or None, mp_context=context) as pool:
+        futures = {pool.submit(export_pdf_report, team): team for team in teams}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result(), None
+            except Exception as e:
+                yield futures[future], None, e
+
+
+def run(data_path, out_dir, until=None, days=7, workers=0, force=False, snapshot_path=None):
+    started = time.perf_counter()
+    timings = {}
+
+    store = load_store(data_path, snapshot_path)
+    timings["load_data_s"] = time.perf_counter() - started
+
+    mark = time.perf_counter()
+    teams = get_teams_with_recent_sprint(store.teams, days=days, until=until)
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = {} if force else read_manifest(out_dir)
+    fingerprints = {team.team_name: report_fingerprint(team) for team in teams}
+    skipped, pending = [], []
+    for team in teams:
+        file_name = report_file_name(team)
+        unchanged = manifest.get(file_name) == fingerprints[team.team_name]
+        if unchanged and os.path.exists(os.path.join(out_dir, file_name)):
+            skipped.append(team)
+        else:
+            pending.append(team)
+    timings["select_s"] = time.perf_counter() - mark
+
+    mark = time.perf_counter()
+    written, failed = [], []
+    for team, pdf, error in render_reports(pending, workers):
+        file_name = report_file_name(team)
+        if error is not None:
+            failed.append({"team": team.team_name, "error": repr(error)})
+            continue
+        write_file(os.path.join(out_dir, file_name), pdf)
+        manifest[file_name] = fingerprints[team.team_name]
+        written.append(team)
+    timings["render_s"] = time.perf_counter() - mark
+
+    write_file(os.path.join(out_dir, MANIFEST_NAME), json.dumps(manifest, indent=2, sort_keys=True), "w")
+    timings["total_s"] = time.perf_counter() - started
+
+    def describe(team):
+        latest = get_latest_sprint(team)
+        return {
+            "team": team.team_name,
+            "file": report_file_name(team),
+            "sprint_id": latest.sprint_id,
+            "end_date": latest.end_date,
+            "risk": calculate_risk(team),
+        }
+
+    return {
+        "data": data_path,
+        "out_dir": out_dir,
+        "window": {"days": days, "until": (until or datetime.today()).date().isoformat()},
+        "teams_in_window": len(teams),
+        "written": [describe(t) for t in written],
+        "skipped": [describe(t) for t in skipped],
+        "failed": failed,
+        "timings": {k: round(v, 4) for k, v in timings.items()},
+    }
+
+
+def main(argv=None):
+    default_data = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Data.json")
+    parser = argparse.ArgumentParser(description="Generate weekly sprint PDF reports")
+    parser.add_argument("--data", default=os.environ.get("COPILOT_DATA_PATH", default_data))
+    parser.add_argument("--snapshot", default=os.environ.get("COPILOT_DATA_SNAPSHOT_PATH", ""))
+    parser.add_argument("--out", required=True, help="output directory for the PDFs")
+    parser.add_argument("--until", type=parse_date, help="end of the window, YYYY-MM-DD (default: today)")
+    window = parser.add_mutually_exclusive_group()
+    window.add_argument("--days", type=int, default=7, help="window length in days (default: 7)")
+    window.add_argument("--since", type=parse_date, help="start of the window, YYYY-MM-DD")
+    parser.add_argument("--workers", type=int, default=0, help="render processes (0 = one per CPU)")
+    parser.add_argument("--force", action="store_true", help="re-render unchanged reports too")
+    parser.add_argument("--summary", help="also write the JSON run summary to this file")
+    args = parser.parse_args(argv)
+
+    until = args.until
+    days = args.days
+    if args.since:
+        until = until or datetime.today().replace(hour=0, minute=0, second=0, microsecond=0)
+        days = (until - args.since).days
+
+    summary = run(args.data, args.out, until=until, days=days, workers=args.workers,
+                  force=args.force, snapshot_path=args.snapshot)
+    text = json.dumps(summary, indent=2, ensure_ascii=False)
+    print(text)
+    if args.summary:
+        write_file(args.summary, text, "w")
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())